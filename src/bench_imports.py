@@ -0,0 +1,124 @@
+"""
+Benchmark do tempo de inicialização (importação) de cada etapa do pipeline.
+
+Executa `python -X importtime -c "import <módulo>"` em um processo novo para cada
+etapa, usa o melhor de várias execuções e falha (código de saída 1) quando alguma
+etapa ultrapassa seu orçamento ou carrega uma biblioteca pesada que não deveria.
+
+Uso: python src/bench_imports.py [etapa ...]
+"""
+
+import os
+import sys
+import subprocess
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent
+
+RUNS = int(os.getenv('BENCH_RUNS', '5'))
+
+# Bibliotecas que os caminhos leves não podem importar
+HEAVY_MODULES = ('pandas', 'numpy', 'matplotlib')
+
+# etapa: (módulo importado, orçamento em ms, caminho leve?)
+STAGES = {
+    'readme': ('update_readme', 100, True),
+    'levels': ('process_data', 100, True),
+    'chart-startup': ('generate_chart', 100, True),
+    'collect': ('collect_data', 300, False),
+    'process': ('validate_data', 1500, False),
+    'chart-render': ('matplotlib.pyplot', 2000, False),
+}
+
+
+def measure_import(module):
+    """
+    Mede a importação de um módulo em um interpretador novo.
+
+    Args:
+        module (str): Nome do módulo
+
+    Returns:
+        tuple: (tempo cumulativo em ms, conjunto de módulos importados)
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+        cwd=SRC_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Falha ao importar {module}:\n{result.stderr[-2000:]}")
+
+    cumulative = None
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative_us, name = line.split('|')
+        name = name.strip()
+        imported.add(name)
+        if name == module:
+            cumulative = int(cumulative_us) / 1000
+
+    if cumulative is None:
+        raise RuntimeError(f"Tempo de importação de {module} não encontrado.")
+    return cumulative, imported
+
+
+def run_stage(name):
+    """
+    Executa o benchmark de uma etapa.
+
+    Args:
+        name (str): Nome da etapa em STAGES
+
+    Returns:
+        dict: Resultado com tempo, orçamento e problemas encontrados
+    """
+    module, budget, light = STAGES[name]
+    best = None
+    imported = set()
+    for _ in range(RUNS):
+        elapsed, imported = measure_import(module)
+        best = elapsed if best is None else min(best, elapsed)
+
+    problems = []
+    if best > budget:
+        problems.append(f"{best:.1f} ms > orçamento de {budget} ms")
+    if light:
+        heavy = sorted(m for m in HEAVY_MODULES if m in imported)
+        if heavy:
+            problems.append(f"importa {', '.join(heavy)}")
+
+    return {'stage': name, 'module': module, 'ms': best, 'budget': budget, 'problems': problems}
+
+
+def main():
+    """
+    Função principal do script.
+    """
+    stages = sys.argv[1:] or list(STAGES)
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        print(f"Etapa(s) desconhecida(s): {', '.join(unknown)} (disponíveis: {', '.join(STAGES)})")
+        sys.exit(1)
+
+    print(f"=== Benchmark de Inicialização (melhor de {RUNS}) ===")
+    print(f"{'Etapa':<15}{'Módulo':<20}{'Tempo (ms)':>12}{'Orçamento':>12}")
+
+    failed = False
+    for name in stages:
+        result = run_stage(name)
+        status = "✓" if not result['problems'] else "✗"
+        print(f"{name:<15}{result['module']:<20}{result['ms']:>12.1f}{result['budget']:>12} {status}")
+        for problem in result['problems']:
+            print(f"    - {problem}")
+        failed = failed or bool(result['problems'])
+
+    if failed:
+        print("\n✗ Orçamento de inicialização excedido.")
+        sys.exit(1)
+    print("\n✓ Todas as etapas dentro do orçamento.")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,6 @@
 """
 Script para coletar dados de opções da API Alpha Vantage.
-Salva os dados brutos em formato JSON para processamento posterior.
+Salva os dados brutos comprimidos para processamento posterior (ver raw_store.py).
 """
 
 import os
@@ -10,6 +10,8 @@ import requests
 from datetime import datetime
 from dotenv import load_dotenv
 
+import raw_store
+
 # Carregar variáveis de ambiente
 load_dotenv()
 
@@ -62,7 +64,12 @@ def fetch_options_data(symbol, date=None):
 
 def save_raw_data(data, symbol):
     """
-    Salva os dados brutos em arquivo JSON.
+    Salva os dados brutos no armazenamento compacto.
+    
+    Os metadados dos contratos vão para a tabela de contratos do símbolo e as
+    cotações/gregas do dia para um arquivo comprimido. Após gravar, confere se o
+    arquivo reconstrói exatamente o payload original; se não reconstruir, o
+    arquivo é removido para não ser lido pelo processamento.
     
     Args:
         data (dict): Dados da API
@@ -72,18 +79,20 @@ def save_raw_data(data, symbol):
         print("Nenhum dado para salvar.")
         return False
     
-    # Criar diretório se não existir
-    os.makedirs('data/raw', exist_ok=True)
-    
-    # Nome do arquivo com timestamp
     today = datetime.now().strftime('%Y-%m-%d')
-    filename = f"data/raw/{today}_{symbol}.json"
     
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        filename = raw_store.write_day(data, symbol, today)
+        
+        if not raw_store.verify_roundtrip(data, filename, symbol):
+            filename.unlink()
+            print(f"Erro: {filename} não reconstrói o payload original; arquivo removido.")
+            return False
         
+        before = len(json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8'))
+        after = filename.stat().st_size
         print(f"Dados salvos em: {filename}")
+        print(f"Tamanho em disco: {after:,} bytes (JSON indentado: {before:,} bytes)")
         return True
         
     except Exception as e:
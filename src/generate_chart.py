@@ -1,17 +1,37 @@
 """
 Script para gerar gráfico de visualização da exposição Gamma (GEX).
+
+O matplotlib só é importado (e o estilo aplicado) quando um gráfico é gerado.
 """
 
 import os
 import sys
 import json
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
 from datetime import datetime
 from pathlib import Path
 
-# Configurar estilo do matplotlib
-plt.style.use('seaborn-v0_8-darkgrid')
+_plt = None
+
+def get_pyplot():
+    """
+    Importa o matplotlib e configura backend e estilo uma única vez.
+    
+    Returns:
+        module: matplotlib.pyplot configurado
+    """
+    global _plt
+    
+    if _plt is None:
+        import matplotlib
+        # Backend sem interface gráfica: evita a detecção de GUI na importação
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        
+        # Configurar estilo do matplotlib
+        plt.style.use('seaborn-v0_8-darkgrid')
+        _plt = plt
+    
+    return _plt
 
 def load_latest_processed_data(symbol):
     """
@@ -66,6 +86,7 @@ def generate_gex_chart(data):
         colors.append('#2ecc71' if item['gex'] > 0 else '#e74c3c')
     
     # Criar figura
+    plt = get_pyplot()
     fig, ax = plt.subplots(figsize=(14, 8))
     
     # Plotar barras
@@ -138,7 +159,7 @@ def save_chart(fig, symbol):
         print(f"Erro ao salvar gráfico: {e}")
         return False
     finally:
-        plt.close(fig)
+        get_pyplot().close(fig)
 
 def main():
     """
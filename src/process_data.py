@@ -1,15 +1,20 @@
 """
 Script para processar dados de opções e calcular exposição Gamma (GEX).
 Identifica níveis chave: Call Wall, Put Wall e Gamma Flip.
+
+Com `--levels`, apenas exibe os níveis do último processamento. O pandas é importado
+somente nas funções que o usam, para que esse caminho inicie sem carregá-lo.
 """
 
 import os
 import sys
 import json
-import pandas as pd
 from datetime import datetime
 from pathlib import Path
 
+import raw_store
+import regime_state
+
 def load_latest_raw_data(symbol):
     """
     Carrega o arquivo de dados brutos mais recente para o símbolo especificado.
@@ -26,22 +31,17 @@ def load_latest_raw_data(symbol):
         print("Diretório de dados brutos não encontrado.")
         return None
     
-    # Buscar arquivos do símbolo
-    files = list(raw_dir.glob(f"*_{symbol}.json"))
+    # Buscar o arquivo mais recente do símbolo (compacto ou JSON legado)
+    latest_file = raw_store.latest_day_file(symbol)
     
-    if not files:
+    if latest_file is None:
         print(f"Nenhum arquivo encontrado para {symbol}.")
         return None
     
-    # Pegar o mais recente
-    latest_file = max(files, key=lambda p: p.stat().st_mtime)
-    
     print(f"Carregando dados de: {latest_file}")
     
     try:
-        with open(latest_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return data
+        return raw_store.read_day(latest_file, symbol)
     except Exception as e:
         print(f"Erro ao carregar arquivo: {e}")
         return None
@@ -66,10 +66,12 @@ def parse_options_data(raw_data):
         print("Nenhum dado de opções encontrado.")
         return None
     
+    import pandas as pd
+    
     df = pd.DataFrame(options_list)
     
     # Converter tipos de dados
-    numeric_columns = ['strike', 'bid', 'ask', 'last', 'volume', 'open_interest',
+    numeric_columns = ['strike', 'bid', 'ask', 'last', 'mark', 'volume', 'open_interest',
                       'delta', 'gamma', 'theta', 'vega', 'rho', 'implied_volatility']
     
     for col in numeric_columns:
@@ -117,12 +119,54 @@ def calculate_gex(df):
     
     return gex_by_strike
 
-def identify_key_levels(gex_df):
+def estimate_spot(df):
+    """
+    Estima o preço do ativo pela paridade put-call no vencimento mais próximo.
+    
+    O payload de opções não traz o preço do ativo; no strike em que call e put
+    têm preços mais próximos, spot ≈ strike + call - put.
+    
+    Args:
+        df (pd.DataFrame): DataFrame com dados de opções
+    
+    Returns:
+        float: Preço estimado, ou None se não for possível estimar
+    """
+    if df is None or df.empty or 'expiration' not in df.columns:
+        return None
+    
+    import pandas as pd
+    
+    # Preço de referência: mark, ou o meio do book, ou o último negócio
+    price = pd.Series(float('nan'), index=df.index)
+    if 'mark' in df.columns:
+        price = df['mark']
+    if {'bid', 'ask'}.issubset(df.columns):
+        price = price.fillna((df['bid'] + df['ask']) / 2)
+    if 'last' in df.columns:
+        price = price.fillna(df['last'])
+    
+    nearest = df.assign(price=price)
+    nearest = nearest[(nearest['expiration'] == nearest['expiration'].min()) & (nearest['price'] > 0)]
+    pairs = nearest.pivot_table(index='strike', columns='type', values='price', aggfunc='mean')
+    
+    if 'call' not in pairs.columns or 'put' not in pairs.columns:
+        return None
+    
+    diff = (pairs['call'] - pairs['put']).dropna()
+    if diff.empty:
+        return None
+    
+    strike = diff.abs().idxmin()
+    return float(strike + diff[strike])
+
+def identify_key_levels(gex_df, spot=None):
     """
     Identifica níveis chave: Call Wall, Put Wall e Gamma Flip.
     
     Args:
         gex_df (pd.DataFrame): DataFrame com GEX por strike
+        spot (float): Preço estimado do ativo (opcional)
     
     Returns:
         dict: Dicionário com os níveis identificados
@@ -171,12 +215,13 @@ def identify_key_levels(gex_df):
         },
         'gamma_flip': float(gamma_flip) if gamma_flip is not None else None,
         'total_gex': float(total_gex),
+        'spot': spot,
         'market_regime': 'Positive Gamma' if total_gex > 0 else 'Negative Gamma'
     }
     
     return levels
 
-def save_processed_data(gex_df, levels, symbol):
+def save_processed_data(gex_df, levels, symbol, analytics=None, quality=None):
     """
     Salva os dados processados em arquivo JSON.
     
@@ -184,6 +229,8 @@ def save_processed_data(gex_df, levels, symbol):
         gex_df (pd.DataFrame): DataFrame com GEX calculado
         levels (dict): Níveis chave identificados
         symbol (str): Símbolo do ativo
+        analytics (dict): Métricas de regime do histórico (opcional)
+        quality (dict): Relatório de validação dos dados (opcional)
     """
     os.makedirs('data/processed', exist_ok=True)
     
@@ -196,6 +243,8 @@ def save_processed_data(gex_df, levels, symbol):
         'symbol': symbol,
         'timestamp': datetime.now().isoformat(),
         'key_levels': levels,
+        'regime_analytics': analytics,
+        'data_quality': quality,
         'gex_by_strike': gex_df.to_dict('records') if gex_df is not None else []
     }
     
@@ -209,6 +258,48 @@ def save_processed_data(gex_df, levels, symbol):
         print(f"Erro ao salvar dados processados: {e}")
         return False
 
+def load_latest_levels(symbol):
+    """
+    Carrega os níveis chave do arquivo processado mais recente.
+    
+    Args:
+        symbol (str): Símbolo do ativo
+    
+    Returns:
+        dict: Níveis chave, ou None se não houver dados processados
+    """
+    files = list(Path('data/processed').glob(f"*_{symbol}.json"))
+    
+    if not files:
+        print(f"Nenhum arquivo processado encontrado para {symbol}.")
+        return None
+    
+    latest_file = max(files, key=lambda p: p.name)
+    
+    try:
+        with open(latest_file, 'r', encoding='utf-8') as f:
+            return json.load(f).get('key_levels')
+    except Exception as e:
+        print(f"Erro ao carregar arquivo: {e}")
+        return None
+
+def print_levels(levels):
+    """
+    Imprime os níveis chave identificados.
+    
+    Args:
+        levels (dict): Níveis chave
+    """
+    if not levels:
+        return
+    
+    print("\n=== NÍVEIS IDENTIFICADOS ===")
+    print(f"Call Wall: ${levels['call_wall']['strike']:.2f}" if levels['call_wall']['strike'] else "Call Wall: N/A")
+    print(f"Put Wall: ${levels['put_wall']['strike']:.2f}" if levels['put_wall']['strike'] else "Put Wall: N/A")
+    print(f"Gamma Flip: ${levels['gamma_flip']:.2f}" if levels['gamma_flip'] else "Gamma Flip: N/A")
+    print(f"Total GEX: {levels['total_gex']:,.0f}")
+    print(f"Regime de Mercado: {levels['market_regime']}")
+
 def main():
     """
     Função principal do script.
@@ -220,6 +311,14 @@ def main():
     print(f"Data/Hora: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print()
     
+    # Modo rápido: apenas exibir os níveis do último processamento
+    if '--levels' in sys.argv[1:]:
+        levels = load_latest_levels(symbol)
+        print_levels(levels)
+        sys.exit(0 if levels else 1)
+    
+    import validate_data
+    
     # 1. Carregar dados brutos
     raw_data = load_latest_raw_data(symbol)
     if not raw_data:
@@ -232,24 +331,36 @@ def main():
         print("\n✗ Falha ao parsear dados.")
         sys.exit(1)
     
-    # 3. Calcular GEX
+    # 3. Validar dados (duplicatas, faixas e campos obrigatórios)
+    print("\nValidando dados...")
+    today = datetime.now().strftime('%Y-%m-%d')
+    df, quarantine, quality = validate_data.validate_options_data(df)
+    validate_data.print_report(quality)
+    quarantine_file = validate_data.save_quarantine(quarantine, symbol, today)
+    if quarantine_file:
+        print(f"Linhas em quarentena salvas em: {quarantine_file}")
+    
+    # 4. Calcular GEX
     print("\nCalculando exposição Gamma...")
     gex_df = calculate_gex(df)
     
-    # 4. Identificar níveis chave
+    # 5. Identificar níveis chave
     print("Identificando níveis chave...")
-    levels = identify_key_levels(gex_df)
+    levels = identify_key_levels(gex_df, estimate_spot(df))
+    
+    print_levels(levels)
     
+    # 6. Atualizar métricas de regime do histórico (incremental)
+    analytics = None
     if levels:
-        print("\n=== NÍVEIS IDENTIFICADOS ===")
-        print(f"Call Wall: ${levels['call_wall']['strike']:.2f}" if levels['call_wall']['strike'] else "Call Wall: N/A")
-        print(f"Put Wall: ${levels['put_wall']['strike']:.2f}" if levels['put_wall']['strike'] else "Put Wall: N/A")
-        print(f"Gamma Flip: ${levels['gamma_flip']:.2f}" if levels['gamma_flip'] else "Gamma Flip: N/A")
-        print(f"Total GEX: {levels['total_gex']:,.0f}")
-        print(f"Regime de Mercado: {levels['market_regime']}")
-    
-    # 5. Salvar dados processados
-    success = save_processed_data(gex_df, levels, symbol)
+        analytics = regime_state.advance(symbol, today, levels)
+        if analytics:
+            stats = analytics['windows']['20']
+            zscore = f"{stats['zscore']:+.2f}" if stats['zscore'] is not None else "N/A"
+            print(f"Z-score do Total GEX (20d): {zscore}")
+    
+    # 7. Salvar dados processados
+    success = save_processed_data(gex_df, levels, symbol, analytics, quality)
     
     if success:
         print("\n✓ Processamento concluído com sucesso!")
@@ -0,0 +1,472 @@
+"""
+Armazenamento compacto dos dados brutos de opções.
+
+Cada dia é salvo comprimido (zstd, se disponível, ou gzip) e separado em duas partes:
+- Tabela de contratos (dimensão): metadados estáticos (ID, símbolo, expiração, strike, tipo),
+  gravados uma única vez por contrato e referenciados por um ID inteiro. A tabela é
+  append-only: cada dia com contratos novos grava um arquivo incremental só com eles.
+- Arquivo diário: apenas cotações e gregas, em formato colunar, apontando para o ID do contrato.
+
+A reconstrução devolve exatamente o payload original da API (mesmos valores e ordem das chaves).
+"""
+
+import os
+import sys
+import gzip
+import json
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+RAW_DIR = Path('data/raw')
+CONTRACTS_DIR = RAW_DIR / 'contracts'
+
+# Campos que não mudam de um dia para o outro para o mesmo contrato
+STATIC_FIELDS = ('contractID', 'symbol', 'expiration', 'strike', 'type')
+
+FORMAT_VERSION = 1
+
+
+def _compress(payload, extension):
+    """
+    Comprime bytes de acordo com a extensão do arquivo.
+
+    Args:
+        payload (bytes): Conteúdo a ser comprimido
+        extension (str): '.zst' ou '.gz'
+
+    Returns:
+        bytes: Conteúdo comprimido
+    """
+    if extension == '.zst':
+        return zstandard.ZstdCompressor(level=19).compress(payload)
+    # mtime=0 deixa o arquivo determinístico e evita diffs sem mudança real
+    return gzip.compress(payload, compresslevel=9, mtime=0)
+
+
+def _decompress(payload, extension):
+    """
+    Descomprime bytes de acordo com a extensão do arquivo.
+
+    Args:
+        payload (bytes): Conteúdo comprimido
+        extension (str): '.zst', '.gz' ou '.json'
+
+    Returns:
+        bytes: Conteúdo original
+    """
+    if extension == '.zst':
+        if zstandard is None:
+            raise RuntimeError("Pacote 'zstandard' necessário para ler arquivos .zst")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    if extension == '.gz':
+        return gzip.decompress(payload)
+    return payload
+
+
+def _default_extension():
+    """
+    Retorna a extensão de compressão padrão (zstd quando instalado).
+    """
+    return '.zst' if zstandard is not None else '.gz'
+
+
+def _write_atomic(path, payload):
+    """
+    Grava bytes em um arquivo temporário e renomeia, evitando arquivos parciais.
+    """
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def _dumps(obj):
+    """
+    Serializa em JSON compacto (UTF-8).
+    """
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _read_json(path):
+    """
+    Lê um arquivo JSON, comprimido ou não.
+    """
+    with open(path, 'rb') as f:
+        payload = f.read()
+    return json.loads(_decompress(payload, path.suffix))
+
+
+def contract_delta_files(symbol):
+    """
+    Lista os arquivos de contratos do símbolo em ordem de gravação.
+
+    A tabela de contratos é append-only: cada gravação com contratos novos cria
+    um arquivo `{seq}_{date}.json.*` contendo apenas esses contratos. Arquivos já
+    gravados nunca são reescritos, então o git só armazena bytes novos a cada dia.
+    """
+    directory = CONTRACTS_DIR / symbol
+    files = list(directory.glob('*.json.zst')) + list(directory.glob('*.json.gz'))
+    return sorted(files, key=lambda p: p.name)
+
+
+def load_contracts(symbol):
+    """
+    Carrega a tabela de contratos do símbolo juntando os arquivos incrementais.
+
+    Args:
+        symbol (str): Símbolo do ativo
+
+    Returns:
+        list: Lista de dicionários com os metadados; o índice é o ID do contrato
+    """
+    contracts = []
+    for path in contract_delta_files(symbol):
+        document = _read_json(path)
+        if document['first_id'] != len(contracts):
+            raise RuntimeError(f"Tabela de contratos inconsistente em {path}")
+        contracts.extend(document['contracts'])
+    return contracts
+
+
+def append_contracts(new_contracts, first_id, symbol, date):
+    """
+    Grava os contratos novos em um arquivo incremental próprio.
+
+    Args:
+        new_contracts (list): Metadados dos contratos novos
+        first_id (int): ID do primeiro contrato novo
+        symbol (str): Símbolo do ativo
+        date (str): Data no formato YYYY-MM-DD
+
+    Returns:
+        Path: Caminho do arquivo gravado
+    """
+    directory = CONTRACTS_DIR / symbol
+    directory.mkdir(parents=True, exist_ok=True)
+    sequence = len(contract_delta_files(symbol))
+    path = directory / f"{sequence:06d}_{date}.json{_default_extension()}"
+    document = {'version': FORMAT_VERSION, 'first_id': first_id, 'contracts': new_contracts}
+    _write_atomic(path, _compress(_dumps(document), path.suffix))
+    return path
+
+
+def _contract_key(static):
+    """
+    Chave única de um contrato a partir dos seus metadados estáticos.
+    """
+    return json.dumps(static, ensure_ascii=False, separators=(',', ':'))
+
+
+def encode_payload(data, contracts):
+    """
+    Separa o payload da API em metadados de contrato e dados diários colunares.
+
+    A tabela `contracts` é atualizada no lugar com os contratos novos.
+
+    Args:
+        data (dict): Payload bruto da API
+        contracts (list): Tabela de contratos atual
+
+    Returns:
+        dict: Documento diário compacto
+    """
+    index = {_contract_key(c): i for i, c in enumerate(contracts)}
+    records = data.get('data')
+    if not isinstance(records, list):
+        # 'data' ausente, nulo ou de outro tipo fica no envelope como veio
+        records = []
+
+    layouts = []
+    layout_index = {}
+    layout_ids = []
+    contract_ids = []
+    columns = {}
+
+    for position, record in enumerate(records):
+        keys = tuple(record.keys())
+        layout_id = layout_index.get(keys)
+        if layout_id is None:
+            layout_id = layout_index[keys] = len(layouts)
+            layouts.append(list(keys))
+        layout_ids.append(layout_id)
+
+        static = {k: record[k] for k in keys if k in STATIC_FIELDS}
+        key = _contract_key(static)
+        contract_id = index.get(key)
+        if contract_id is None:
+            contract_id = index[key] = len(contracts)
+            contracts.append(static)
+        contract_ids.append(contract_id)
+
+        for k in keys:
+            if k in STATIC_FIELDS:
+                continue
+            column = columns.get(k)
+            if column is None:
+                # Campo surgiu no meio do dia: preencher posições anteriores
+                column = columns[k] = [None] * position
+            column.append(record[k])
+
+        for k, column in columns.items():
+            if len(column) <= position:
+                column.append(None)
+
+    return {
+        'version': FORMAT_VERSION,
+        'envelope': {k: v for k, v in data.items() if k != 'data' or not isinstance(v, list)},
+        'envelope_keys': list(data.keys()),
+        'layouts': layouts,
+        'layout_ids': layout_ids,
+        'contract_ids': contract_ids,
+        'columns': columns
+    }
+
+
+def decode_payload(document, contracts):
+    """
+    Reconstrói o payload original da API a partir do documento diário.
+
+    Args:
+        document (dict): Documento diário compacto
+        contracts (list): Tabela de contratos
+
+    Returns:
+        dict: Payload idêntico ao retornado pela API
+    """
+    layouts = document['layouts']
+    columns = document['columns']
+
+    records = []
+    for position, (layout_id, contract_id) in enumerate(
+            zip(document['layout_ids'], document['contract_ids'])):
+        static = contracts[contract_id]
+        record = {}
+        for k in layouts[layout_id]:
+            record[k] = static[k] if k in STATIC_FIELDS else columns[k][position]
+        records.append(record)
+
+    envelope = document['envelope']
+    data = {}
+    for k in document['envelope_keys']:
+        data[k] = envelope[k] if k in envelope else records
+    return data
+
+
+def day_path(date, symbol):
+    """
+    Retorna o caminho do arquivo diário existente (ou o padrão para gravação).
+    """
+    for extension in ('.zst', '.gz'):
+        path = RAW_DIR / f"{date}_{symbol}.json{extension}"
+        if path.exists():
+            return path
+    return RAW_DIR / f"{date}_{symbol}.json{_default_extension()}"
+
+
+def write_day(data, symbol, date):
+    """
+    Grava o payload de um dia no armazenamento compacto.
+
+    O documento é conferido em memória antes de qualquer gravação: se não
+    reconstruir o payload, nada é gravado (nem os contratos novos). Os contratos
+    novos são gravados antes do arquivo diário, para que um arquivo diário nunca
+    referencie um ID inexistente.
+
+    Args:
+        data (dict): Payload bruto da API
+        symbol (str): Símbolo do ativo
+        date (str): Data no formato YYYY-MM-DD
+
+    Returns:
+        Path: Caminho do arquivo diário gravado
+    """
+    RAW_DIR.mkdir(parents=True, exist_ok=True)
+    contracts = load_contracts(symbol)
+    known = len(contracts)
+
+    document = encode_payload(data, contracts)
+    if _dumps(decode_payload(document, contracts)) != _dumps(data):
+        raise RuntimeError(f"Documento de {date} não reconstrói o payload original")
+
+    if len(contracts) != known:
+        append_contracts(contracts[known:], known, symbol, date)
+
+    path = day_path(date, symbol)
+    _write_atomic(path, _compress(_dumps(document), path.suffix))
+    return path
+
+
+def read_day(path, symbol, contracts=None):
+    """
+    Lê um arquivo diário (compacto ou JSON legado) e reconstrói o payload.
+
+    Args:
+        path (Path): Caminho do arquivo diário
+        symbol (str): Símbolo do ativo
+        contracts (list): Tabela de contratos já carregada (opcional)
+
+    Returns:
+        dict: Payload original da API
+    """
+    path = Path(path)
+    document = _read_json(path)
+    if path.suffix == '.json':
+        return document
+    if contracts is None:
+        contracts = load_contracts(symbol)
+    return decode_payload(document, contracts)
+
+
+def verify_roundtrip(data, path, symbol):
+    """
+    Confere se o arquivo gravado reconstrói exatamente o payload original.
+
+    Args:
+        data (dict): Payload original
+        path (Path): Arquivo diário gravado
+        symbol (str): Símbolo do ativo
+
+    Returns:
+        bool: True se a reconstrução for idêntica (valores e ordem das chaves)
+    """
+    restored = read_day(path, symbol)
+    return _dumps(restored) == _dumps(data)
+
+
+def list_day_files(symbol):
+    """
+    Lista os arquivos diários do símbolo (compactos e JSON legado).
+    """
+    files = []
+    for pattern in (f"*_{symbol}.json", f"*_{symbol}.json.gz", f"*_{symbol}.json.zst"):
+        files.extend(RAW_DIR.glob(pattern))
+    return files
+
+
+def latest_day_file(symbol):
+    """
+    Retorna o arquivo diário mais recente do símbolo, ou None.
+    """
+    files = list_day_files(symbol)
+    if not files:
+        return None
+    # O nome começa com a data (YYYY-MM-DD); mtime desempata formatos do mesmo dia
+    return max(files, key=lambda p: (p.name.split('_', 1)[0], p.stat().st_mtime))
+
+
+def storage_report(symbol):
+    """
+    Calcula o espaço em disco por dia antes (JSON indentado) e depois (compacto).
+
+    O tamanho "depois" é o que cada dia acrescenta ao repositório: o arquivo
+    diário mais os arquivos de contratos novos gravados naquele dia.
+
+    Args:
+        symbol (str): Símbolo do ativo
+
+    Returns:
+        list: Lista de dicionários com date, before_bytes e after_bytes
+    """
+    files = sorted(list_day_files(symbol), key=lambda p: p.name)
+    if not files:
+        return []
+
+    contract_bytes = {}
+    for path in contract_delta_files(symbol):
+        date = path.name.split('_', 1)[1].split('.', 1)[0]
+        contract_bytes[date] = contract_bytes.get(date, 0) + path.stat().st_size
+
+    contracts = load_contracts(symbol)
+
+    report = []
+    for p in files:
+        date = p.name.split('_', 1)[0]
+        data = read_day(p, symbol, contracts)
+        # Mesmo formato que save_raw_data gravava originalmente
+        before = len(json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8'))
+        after = p.stat().st_size + contract_bytes.get(date, 0)
+        report.append({
+            'date': date,
+            'file': p.name,
+            'before_bytes': before,
+            'after_bytes': after
+        })
+    return report
+
+
+def print_storage_report(symbol):
+    """
+    Imprime o relatório de espaço em disco por dia.
+    """
+    report = storage_report(symbol)
+    if not report:
+        print(f"Nenhum arquivo bruto encontrado para {symbol}.")
+        return
+
+    print(f"{'Data':<12}{'Antes (bytes)':>16}{'Depois (bytes)':>16}{'Razão':>9}")
+    total_before = total_after = 0
+    for row in report:
+        total_before += row['before_bytes']
+        total_after += row['after_bytes']
+        ratio = row['before_bytes'] / row['after_bytes'] if row['after_bytes'] else 0
+        print(f"{row['date']:<12}{row['before_bytes']:>16,}{row['after_bytes']:>16,}{ratio:>8.1f}x")
+    ratio = total_before / total_after if total_after else 0
+    print(f"{'Total':<12}{total_before:>16,}{total_after:>16,}{ratio:>8.1f}x")
+
+
+def migrate_legacy(symbol):
+    """
+    Converte arquivos JSON legados (indentados) para o formato compacto.
+
+    O JSON original só é removido depois que a reconstrução for conferida.
+
+    Args:
+        symbol (str): Símbolo do ativo
+
+    Returns:
+        int: Número de arquivos convertidos
+    """
+    converted = 0
+    for p in sorted(RAW_DIR.glob(f"*_{symbol}.json")):
+        date = p.name.split('_', 1)[0]
+        with open(p, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        try:
+            path = write_day(data, symbol, date)
+        except RuntimeError as e:
+            print(f"{e}; arquivo original mantido.")
+            continue
+        if verify_roundtrip(data, path, symbol):
+            p.unlink()
+            converted += 1
+            print(f"Convertido: {p.name} -> {path.name}")
+        else:
+            path.unlink()
+            print(f"Falha na conferência de {p.name}; arquivo original mantido.")
+    return converted
+
+
+def main():
+    """
+    Utilitário de linha de comando: `report` ou `migrate`.
+    """
+    command = sys.argv[1] if len(sys.argv) > 1 else 'report'
+    symbol = sys.argv[2] if len(sys.argv) > 2 else os.getenv('TARGET_SYMBOL', 'QQQ')
+
+    if command == 'report':
+        print_storage_report(symbol)
+    elif command == 'migrate':
+        converted = migrate_legacy(symbol)
+        print(f"\n{converted} arquivo(s) convertido(s).")
+        print_storage_report(symbol)
+    else:
+        print(f"Comando desconhecido: {command} (use 'report' ou 'migrate')")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,362 @@
+"""
+Estado incremental das métricas de regime ao longo do histórico.
+
+Mantém, por símbolo, estatísticas em janelas móveis de 20/60/250 dias do GEX total
+(média e variância por Welford, lista ordenada para percentis) e os níveis do dia anterior,
+de forma que cada novo dia seja incorporado sem recarregar os arquivos processados.
+
+O estado é salvo em `data/state/{symbol}.json` e pode ser reconstruído a partir de
+`data/processed/` com `python src/regime_state.py rebuild QQQ`.
+"""
+
+import os
+import sys
+import json
+import math
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from pathlib import Path
+
+STATE_DIR = Path('data/state')
+PROCESSED_DIR = Path('data/processed')
+
+WINDOWS = (20, 60, 250)
+STATE_VERSION = 1
+
+
+def new_window(size):
+    """
+    Cria uma janela móvel vazia.
+
+    Args:
+        size (int): Número máximo de dias na janela
+
+    Returns:
+        dict: Janela com valores em ordem de chegada, valores ordenados e acumuladores de Welford
+    """
+    return {
+        'size': size,
+        'values': deque(),
+        'sorted': [],
+        'count': 0,
+        'mean': 0.0,
+        'm2': 0.0,
+        'evicted': None
+    }
+
+
+def _welford_add(window, x):
+    window['count'] += 1
+    delta = x - window['mean']
+    window['mean'] += delta / window['count']
+    window['m2'] += delta * (x - window['mean'])
+
+
+def _welford_remove(window, x):
+    count = window['count'] - 1
+    if count <= 0:
+        window['count'], window['mean'], window['m2'] = 0, 0.0, 0.0
+        return
+    old_mean = window['mean']
+    new_mean = (window['count'] * old_mean - x) / count
+    window['m2'] = max(0.0, window['m2'] - (x - old_mean) * (x - new_mean))
+    window['mean'] = new_mean
+    window['count'] = count
+
+
+def _sorted_remove(values, x):
+    values.pop(bisect_left(values, x))
+
+
+def window_push(window, x):
+    """
+    Adiciona um valor à janela, descartando o mais antigo quando cheia.
+    """
+    window['evicted'] = None
+    if len(window['values']) == window['size']:
+        old = window['values'].popleft()
+        _welford_remove(window, old)
+        _sorted_remove(window['sorted'], old)
+        window['evicted'] = old
+
+    window['values'].append(x)
+    _welford_add(window, x)
+    insort(window['sorted'], x)
+
+
+def window_pop_last(window):
+    """
+    Desfaz o último `window_push` (usado quando o mesmo dia é reprocessado).
+    """
+    x = window['values'].pop()
+    _welford_remove(window, x)
+    _sorted_remove(window['sorted'], x)
+
+    old = window['evicted']
+    if old is not None:
+        window['values'].appendleft(old)
+        _welford_add(window, old)
+        insort(window['sorted'], old)
+        window['evicted'] = None
+
+
+def window_stats(window, x):
+    """
+    Calcula z-score, percentil e quantis do valor `x` em relação à janela.
+
+    A janela contém apenas os dias anteriores: incluir o próprio `x` puxaria o
+    z-score para zero (com dois dias ele seria sempre ±0,707).
+
+    Args:
+        window (dict): Janela com os dias anteriores (ainda sem `x`)
+        x (float): Valor do dia
+
+    Returns:
+        dict: Estatísticas da janela
+    """
+    n = window['count']
+    ordered = window['sorted']
+    std = math.sqrt(window['m2'] / (n - 1)) if n > 1 else 0.0
+
+    below = bisect_left(ordered, x)
+    equal = bisect_right(ordered, x) - below
+
+    def quantile(q):
+        return ordered[min(n - 1, int(q * n))] if n else None
+
+    return {
+        'days': n,
+        'mean': window['mean'] if n else None,
+        'std': std if n > 1 else None,
+        'zscore': (x - window['mean']) / std if std > 0 else None,
+        'percentile': 100.0 * (below + 0.5 * equal) / n if n else None,
+        'p10': quantile(0.10),
+        'p50': quantile(0.50),
+        'p90': quantile(0.90)
+    }
+
+
+def new_state(symbol):
+    """
+    Cria o estado vazio de um símbolo.
+    """
+    return {
+        'version': STATE_VERSION,
+        'symbol': symbol,
+        'last_date': None,
+        'previous': None,
+        'last': None,
+        'windows': {str(size): new_window(size) for size in WINDOWS}
+    }
+
+
+def state_path(symbol):
+    """
+    Retorna o caminho do arquivo de estado do símbolo.
+    """
+    return STATE_DIR / f"{symbol}.json"
+
+
+def load_state(symbol):
+    """
+    Carrega o estado persistido, reconstruindo-o do histórico se não existir.
+
+    Args:
+        symbol (str): Símbolo do ativo
+
+    Returns:
+        dict: Estado incremental
+    """
+    path = state_path(symbol)
+    if not path.exists():
+        print("Estado inexistente; reconstruindo a partir do histórico.")
+        return rebuild_state(symbol)
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except Exception as e:
+        print(f"Erro ao carregar estado ({e}); reconstruindo a partir do histórico.")
+        return rebuild_state(symbol)
+
+    if state.get('version') != STATE_VERSION:
+        print("Versão do estado incompatível; reconstruindo a partir do histórico.")
+        return rebuild_state(symbol)
+
+    for window in state['windows'].values():
+        window['values'] = deque(window['values'])
+    return state
+
+
+def save_state(state):
+    """
+    Salva o estado do símbolo em disco.
+
+    Args:
+        state (dict): Estado incremental
+
+    Returns:
+        bool: True se bem-sucedido
+    """
+    os.makedirs(STATE_DIR, exist_ok=True)
+    path = state_path(state['symbol'])
+
+    serializable = dict(state)
+    serializable['windows'] = {
+        key: dict(window, values=list(window['values']))
+        for key, window in state['windows'].items()
+    }
+
+    try:
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(serializable, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return True
+    except Exception as e:
+        print(f"Erro ao salvar estado: {e}")
+        return False
+
+
+def _snapshot(date, levels):
+    """
+    Extrai dos níveis do dia apenas o necessário para comparações futuras.
+    """
+    return {
+        'date': date,
+        'call_wall': levels['call_wall']['strike'],
+        'put_wall': levels['put_wall']['strike'],
+        'gamma_flip': levels['gamma_flip'],
+        'spot': levels.get('spot'),
+        'total_gex': levels['total_gex']
+    }
+
+
+def _change(current, previous):
+    if current is None or previous is None:
+        return None
+    return current - previous
+
+
+def update_state(state, date, levels):
+    """
+    Incorpora os níveis de um novo dia ao estado e calcula as métricas de contexto.
+
+    Cada atualização é O(1) em relação ao tamanho do histórico: só as janelas de
+    tamanho fixo são tocadas. Reprocessar o mesmo dia substitui o valor anterior.
+
+    Args:
+        state (dict): Estado incremental (alterado no lugar)
+        date (str): Data no formato YYYY-MM-DD
+        levels (dict): Níveis retornados por `identify_key_levels`
+
+    Returns:
+        dict: Métricas de regime do dia, ou None se a data for anterior ao estado
+    """
+    if state['last_date'] is not None and date < state['last_date']:
+        print(f"Data {date} anterior ao estado ({state['last_date']}); ignorando.")
+        return None
+
+    reprocessing = date == state['last_date']
+    if not reprocessing:
+        state['previous'] = state['last']
+
+    today = _snapshot(date, levels)
+    total_gex = today['total_gex']
+
+    # Estatísticas contra os dias anteriores, antes de o dia entrar na janela
+    windows = {}
+    for key, window in state['windows'].items():
+        if reprocessing:
+            window_pop_last(window)
+        windows[key] = window_stats(window, total_gex)
+        window_push(window, total_gex)
+
+    state['last'] = today
+    state['last_date'] = date
+
+    previous = state['previous'] or {}
+    spot = today['spot']
+    flip = today['gamma_flip']
+
+    return {
+        'date': date,
+        'previous_date': previous.get('date'),
+        'wall_migration': {
+            'call_wall': _change(today['call_wall'], previous.get('call_wall')),
+            'put_wall': _change(today['put_wall'], previous.get('put_wall')),
+            'gamma_flip': _change(flip, previous.get('gamma_flip'))
+        },
+        'flip_distance': _change(flip, spot),
+        'flip_distance_pct': 100.0 * (flip - spot) / spot if flip is not None and spot else None,
+        'total_gex_change': _change(total_gex, previous.get('total_gex')),
+        'windows': windows
+    }
+
+
+def rebuild_state(symbol):
+    """
+    Reconstrói o estado a partir de todos os arquivos processados do símbolo.
+
+    Args:
+        symbol (str): Símbolo do ativo
+
+    Returns:
+        dict: Estado incremental atualizado até o último dia disponível
+    """
+    state = new_state(symbol)
+    files = sorted(PROCESSED_DIR.glob(f"*_{symbol}.json"), key=lambda p: p.name)
+
+    for path in files:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Erro ao carregar {path}: {e}")
+            continue
+        if data.get('key_levels'):
+            update_state(state, data['date'], data['key_levels'])
+
+    print(f"Estado reconstruído com {len(files)} arquivo(s) de {symbol}.")
+    return state
+
+
+def advance(symbol, date, levels):
+    """
+    Carrega o estado, incorpora o dia e salva (atalho usado pelo process_data).
+
+    Args:
+        symbol (str): Símbolo do ativo
+        date (str): Data no formato YYYY-MM-DD
+        levels (dict): Níveis do dia
+
+    Returns:
+        dict: Métricas de regime do dia, ou None
+    """
+    state = load_state(symbol)
+    analytics = update_state(state, date, levels)
+    if analytics is None:
+        return None
+    save_state(state)
+    return analytics
+
+
+def main():
+    """
+    Utilitário de linha de comando: `rebuild` reconstrói o estado do histórico.
+    """
+    command = sys.argv[1] if len(sys.argv) > 1 else 'rebuild'
+    symbol = sys.argv[2] if len(sys.argv) > 2 else os.getenv('TARGET_SYMBOL', 'QQQ')
+
+    if command != 'rebuild':
+        print(f"Comando desconhecido: {command} (use 'rebuild')")
+        sys.exit(1)
+
+    state = rebuild_state(symbol)
+    if not save_state(state):
+        sys.exit(1)
+    print(f"Estado salvo em: {state_path(symbol)}")
+
+
+if __name__ == '__main__':
+    main()
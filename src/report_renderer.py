@@ -0,0 +1,368 @@
+"""
+Renderização dos relatórios em Markdown (README e dashboard de múltiplos símbolos).
+
+Os templates são compilados uma única vez na importação do módulo e as seções são
+renderizadas a partir dos dados processados já em memória. Os arquivos de saída só
+são regravados quando o conteúdo muda, mantendo os diffs e commits diários pequenos.
+"""
+
+from string import Template
+from datetime import datetime
+from pathlib import Path
+
+# Templates compilados uma única vez
+TEMPLATES = {
+    'header': Template("""# Análise de Exposição Gamma (GEX) - $symbol
+
+## 📊 Última Atualização: $date
+
+---
+"""),
+    'levels': Template("""
+## 🎯 Níveis Chave Identificados
+
+| Nível | Valor | Descrição |
+|-------|-------|-----------|
+| **Call Wall** 📈 | $call_wall | Resistência forte - Maior concentração de Gamma de CALLs |
+| **Put Wall** 📉 | $put_wall | Suporte forte - Maior concentração de Gamma de PUTs |
+| **Gamma Flip** ⚡ | $gamma_flip | Ponto de mudança de regime de volatilidade |
+
+---
+"""),
+    'regime': Template("""
+## $regime_emoji Regime de Mercado
+
+**Status Atual**: $regime
+
+**Total GEX**: $total_gex
+
+$interpretation
+
+---
+"""),
+    'analytics': Template("""
+## 🧭 Contexto Histórico
+
+**Distância do Gamma Flip ao Spot**: $flip_distance
+
+| Migração vs. $previous | Variação |
+|-------|-------|
+| **Call Wall** | $call_wall |
+| **Put Wall** | $put_wall |
+| **Gamma Flip** | $gamma_flip |
+
+| Janela | Dias | Z-score Total GEX | Percentil | Mediana |
+|-------|-------|-------|-------|-------|
+$rows
+
+---
+"""),
+    'chart': Template("""
+## 📈 Visualização da Exposição Gamma
+
+![GEX Chart](charts/latest_${symbol}_gex.png)
+
+*Gráfico atualizado automaticamente. Barras verdes representam CALLs (GEX positivo), barras vermelhas representam PUTs (GEX negativo).*
+
+---
+"""),
+    'footer': Template("""
+*Última atualização automática: $timestamp UTC*
+"""),
+    'dashboard_header': Template("""# Dashboard de Exposição Gamma (GEX)
+
+## 📊 Última Atualização: $date
+
+| Símbolo | Data | Call Wall | Put Wall | Gamma Flip | Spot | Total GEX | Regime | Z-score (20d) |
+|-------|-------|-------|-------|-------|-------|-------|-------|-------|
+$rows
+
+---
+"""),
+    'dashboard_row': Template(
+        "| [$symbol](#$anchor) | $date | $call_wall | $put_wall | $gamma_flip | $spot | $total_gex | $regime_emoji $regime | $zscore |"
+    ),
+    'dashboard_symbol': Template("""
+# $symbol
+
+**Data**: $date
+"""),
+}
+
+INTERPRETATIONS = {
+    'Positive Gamma': """
+**Interpretação**: O mercado está em regime de **Gamma Positivo**. Neste cenário, os market makers 
+tendem a negociar **contra a tendência** (compram em quedas, vendem em altas) para se proteger. 
+Isso **suprime a volatilidade** e cria um efeito de "imã" nos preços, mantendo o mercado em um range.
+
+**Estratégia Sugerida**: Buscar operações de reversão nos níveis de Call Wall (resistência) e Put Wall (suporte).
+""",
+    'Negative Gamma': """
+**Interpretação**: O mercado está em regime de **Gamma Negativo**. Neste cenário, os market makers 
+tendem a negociar **a favor da tendência** (compram em altas, vendem em quedas) para se proteger. 
+Isso **amplifica a volatilidade** e acelera os movimentos, podendo levar a "gamma squeezes".
+
+**Estratégia Sugerida**: Operar a favor do rompimento. Se o preço romper o Gamma Flip, espera-se movimento acelerado.
+""",
+}
+
+# Seções sem dados variáveis: texto fixo
+STATIC_SECTIONS = {
+    'usage': """
+## 📖 Como Usar Esta Análise
+
+### Antes da Abertura do Mercado (9:30 AM ET)
+
+1. **Verifique o Regime de Mercado** (Gamma Positivo ou Negativo)
+2. **Identifique os Níveis Chave** (Call Wall, Put Wall, Gamma Flip)
+3. **Observe o Preço Pré-Mercado** em relação aos níveis
+
+### Durante os Primeiros 90 Minutos
+
+#### Se o mercado está em **Gamma Positivo**:
+- Espere reversões nos níveis de Call Wall e Put Wall
+- O preço tende a ser "puxado" de volta para dentro do range
+- Volatilidade suprimida
+
+#### Se o mercado está em **Gamma Negativo**:
+- Espere movimentos direcionais acelerados
+- Rompimentos tendem a continuar
+- Volatilidade amplificada
+
+---
+""",
+    'about': """
+## 🔧 Sobre Este Sistema
+
+Este sistema automatizado coleta dados de opções diariamente e calcula a exposição Gamma (GEX) 
+dos market makers para identificar zonas de alta probabilidade de suporte, resistência e mudança 
+de regime de volatilidade.
+
+**Fonte de Dados**: Alpha Vantage API  
+**Atualização**: Diária, via GitHub Actions  
+**Cálculo**: GEX = Open Interest × Gamma × 100 × ±1
+
+---
+""",
+    'disclaimer': """
+## ⚠️ Disclaimer
+
+Esta análise é apenas para fins educacionais e informativos. Não constitui aconselhamento financeiro. 
+Sempre faça sua própria pesquisa e consulte um profissional qualificado antes de tomar decisões de investimento.
+
+---
+""",
+}
+
+CHARTS_DIR = Path('charts')
+
+
+def format_price(value):
+    """
+    Formata um preço/strike, ou N/A quando ausente.
+    """
+    return f"${value:.2f}" if value is not None else "N/A"
+
+
+def format_strike_change(value):
+    """
+    Formata a variação de um nível em relação ao dia anterior.
+    """
+    if value is None:
+        return "N/A"
+    if value == 0:
+        return "sem mudança"
+    return f"{value:+.2f}"
+
+
+def format_zscore(stats):
+    """
+    Formata o z-score de uma janela, ou N/A quando indisponível.
+    """
+    if not stats or stats.get('zscore') is None:
+        return "N/A"
+    return f"{stats['zscore']:+.2f}"
+
+
+def regime_emoji(regime):
+    """
+    Retorna o emoji do regime de mercado.
+    """
+    return "🟢" if regime == "Positive Gamma" else "🔴"
+
+
+def _build_levels(levels):
+    return TEMPLATES['levels'].substitute(
+        call_wall=format_price(levels['call_wall']['strike']),
+        put_wall=format_price(levels['put_wall']['strike']),
+        gamma_flip=format_price(levels['gamma_flip'])
+    )
+
+
+def _build_regime(levels):
+    regime = levels['market_regime']
+    return TEMPLATES['regime'].substitute(
+        regime_emoji=regime_emoji(regime),
+        regime=regime,
+        total_gex=f"{levels['total_gex']:,.0f}",
+        interpretation=INTERPRETATIONS.get(regime, '')
+    )
+
+
+def _build_analytics(analytics):
+    if not analytics:
+        return ""
+
+    migration = analytics['wall_migration']
+
+    if analytics['flip_distance'] is not None:
+        flip_distance = f"{analytics['flip_distance']:+.2f} ({analytics['flip_distance_pct']:+.2f}%)"
+    else:
+        flip_distance = "N/A"
+
+    rows = []
+    for window, stats in analytics['windows'].items():
+        percentile = f"{stats['percentile']:.0f}%" if stats['percentile'] is not None else "N/A"
+        median = f"{stats['p50']:,.0f}" if stats['p50'] is not None else "N/A"
+        rows.append(f"| {window} dias | {stats['days']} | {format_zscore(stats)} | {percentile} | {median} |")
+
+    return TEMPLATES['analytics'].substitute(
+        flip_distance=flip_distance,
+        previous=analytics['previous_date'] or "N/A",
+        call_wall=format_strike_change(migration['call_wall']),
+        put_wall=format_strike_change(migration['put_wall']),
+        gamma_flip=format_strike_change(migration['gamma_flip']),
+        rows="\n".join(rows)
+    )
+
+
+def _build_chart(symbol):
+    # Só há gráfico para os símbolos processados pelo generate_chart
+    if not (CHARTS_DIR / f"latest_{symbol}_gex.png").exists():
+        return ""
+    return TEMPLATES['chart'].substitute(symbol=symbol)
+
+
+def _build_dashboard_row(data):
+    levels = data['key_levels']
+    windows = (data.get('regime_analytics') or {}).get('windows', {})
+    regime = levels['market_regime']
+    return TEMPLATES['dashboard_row'].substitute(
+        symbol=data['symbol'],
+        anchor=data['symbol'].lower(),
+        date=data['date'],
+        call_wall=format_price(levels['call_wall']['strike']),
+        put_wall=format_price(levels['put_wall']['strike']),
+        gamma_flip=format_price(levels['gamma_flip']),
+        spot=format_price(levels.get('spot')),
+        total_gex=f"{levels['total_gex']:,.0f}",
+        regime_emoji=regime_emoji(regime),
+        regime=regime,
+        zscore=format_zscore(windows.get('20'))
+    )
+
+
+def render_symbol_sections(data):
+    """
+    Renderiza as seções específicas de um símbolo (níveis, regime, contexto e gráfico).
+    A seção do gráfico é omitida quando o símbolo não tem imagem em charts/.
+
+    Args:
+        data (dict): Dados processados do símbolo
+
+    Returns:
+        str: Seções concatenadas
+    """
+    levels = data['key_levels']
+    return ''.join((
+        _build_levels(levels),
+        _build_regime(levels),
+        _build_analytics(data.get('regime_analytics')),
+        _build_chart(data['symbol'])
+    ))
+
+
+def _format_timestamp(data):
+    """
+    Usa o horário do processamento (não o da renderização), para que uma nova
+    renderização com os mesmos dados produza exatamente o mesmo arquivo.
+    """
+    timestamp = data.get('timestamp')
+    if not timestamp:
+        return data['date']
+    return datetime.fromisoformat(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def render_readme(data):
+    """
+    Renderiza o README completo de um símbolo.
+
+    Args:
+        data (dict): Dados processados do símbolo
+
+    Returns:
+        str: Conteúdo do README em Markdown
+    """
+    if not data or not data.get('key_levels'):
+        return None
+
+    return ''.join((
+        TEMPLATES['header'].substitute(symbol=data['symbol'], date=data['date']),
+        render_symbol_sections(data),
+        STATIC_SECTIONS['usage'],
+        STATIC_SECTIONS['about'],
+        STATIC_SECTIONS['disclaimer'],
+        TEMPLATES['footer'].substitute(timestamp=_format_timestamp(data))
+    ))
+
+
+def render_dashboard(datasets):
+    """
+    Renderiza o dashboard com todos os símbolos: uma tabela-resumo seguida das
+    seções detalhadas de cada símbolo.
+
+    Args:
+        datasets (list): Lista de dados processados (um por símbolo)
+
+    Returns:
+        str: Conteúdo do dashboard em Markdown
+    """
+    datasets = [d for d in datasets if d and d.get('key_levels')]
+    if not datasets:
+        return None
+
+    rows = []
+    details = []
+    for data in datasets:
+        rows.append(_build_dashboard_row(data))
+        details.append(TEMPLATES['dashboard_symbol'].substitute(symbol=data['symbol'], date=data['date']))
+        details.append(render_symbol_sections(data))
+
+    latest = max(datasets, key=lambda d: d.get('timestamp') or d['date'])
+    return ''.join((
+        TEMPLATES['dashboard_header'].substitute(date=latest['date'], rows="\n".join(rows)),
+        ''.join(details),
+        STATIC_SECTIONS['disclaimer'],
+        TEMPLATES['footer'].substitute(timestamp=_format_timestamp(latest))
+    ))
+
+
+def write_if_changed(path, content):
+    """
+    Grava o arquivo apenas se o conteúdo for diferente do atual.
+
+    Args:
+        path (str): Caminho do arquivo
+        content (str): Novo conteúdo
+
+    Returns:
+        bool: True se o arquivo foi regravado, False se já estava atualizado
+    """
+    path = Path(path)
+    if path.exists() and path.read_text(encoding='utf-8') == content:
+        return False
+
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_text(content, encoding='utf-8')
+    tmp_path.replace(path)
+    return True
@@ -0,0 +1,370 @@
+"""
+Motor de cenários: GEX e níveis chave sob choques de IV, tempo, OI e spot.
+
+Todos os cenários são avaliados juntos como matrizes NumPy (cenários × contratos),
+reaproveitando a cadeia já parseada e validada. O gamma de cada contrato é ajustado
+pela variação do gamma de Black-Scholes entre a situação atual e a chocada, de modo
+que o cenário sem choque reproduz exatamente os níveis do processamento diário.
+
+Formato de um choque (todas as chaves são opcionais):
+    {
+        'name': 'IV +3',
+        'iv_points': 3.0,          # pontos de volatilidade somados à IV de cada contrato
+        'days': 1,                 # dias corridos que passam (vencidos deixam de ter gamma)
+        'spot_pct': 0.0,           # variação percentual do ativo
+        'oi_scale': {500.0: 1.5}   # multiplicador de open interest por strike
+    }
+
+Uso: python src/scenarios.py [arquivo_de_choques.json]
+"""
+
+import os
+import sys
+import json
+import math
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+SCENARIOS_DIR = Path('data/scenarios')
+
+# Vencimentos no próprio dia ainda têm algumas horas de pregão antes da abertura
+MIN_DAYS = 0.25
+MIN_IV = 1e-4
+
+# Cenários por cenário x contrato processados por bloco, limitando a memória
+CHUNK_SIZE = 64
+
+DEFAULT_SHOCKS = [
+    {'name': 'Base'},
+    {'name': 'IV +3', 'iv_points': 3.0},
+    {'name': 'IV -3', 'iv_points': -3.0},
+    {'name': '1 dia de theta', 'days': 1},
+    {'name': '1 dia de theta + IV +3', 'days': 1, 'iv_points': 3.0},
+    {'name': 'Spot -1%', 'spot_pct': -1.0},
+    {'name': 'Spot +1%', 'spot_pct': 1.0},
+]
+
+
+def bs_gamma(spot, strike, sigma, years):
+    """
+    Gamma de Black-Scholes (juros zero), vetorizado.
+
+    Args:
+        spot (np.ndarray): Preço do ativo
+        strike (np.ndarray): Strike
+        sigma (np.ndarray): Volatilidade implícita (fração)
+        years (np.ndarray): Tempo até o vencimento em anos
+
+    Returns:
+        np.ndarray: Gamma por ação
+    """
+    vol_sqrt_t = sigma * np.sqrt(years)
+    d1 = (np.log(spot / strike) + 0.5 * sigma * sigma * years) / vol_sqrt_t
+    return np.exp(-0.5 * d1 * d1) / (math.sqrt(2 * math.pi) * spot * vol_sqrt_t)
+
+
+def prepare_chain(df, spot):
+    """
+    Converte a cadeia validada em arrays NumPy ordenados por strike.
+
+    Args:
+        df (pd.DataFrame): Contratos válidos (saída de `validate_options_data`)
+        spot (float): Preço estimado do ativo
+
+    Returns:
+        dict: Arrays por contrato e os strikes únicos, ou None se não houver dados
+    """
+    if df is None or df.empty or not spot:
+        return None
+
+    df = df[df['gamma'].notna() & df['open_interest'].notna()]
+    df = df.sort_values('strike', kind='stable')
+
+    strike = df['strike'].to_numpy(dtype=float)
+    strikes, group_starts = np.unique(strike, return_index=True)
+
+    if {'expiration', 'date'}.issubset(df.columns):
+        import pandas as pd
+        expiration = pd.to_datetime(df['expiration'], errors='coerce')
+        date = pd.to_datetime(df['date'], errors='coerce')
+        days = (expiration - date).dt.days.to_numpy(dtype=float, na_value=np.nan)
+    else:
+        days = np.full(len(df), np.nan)
+
+    if 'implied_volatility' in df.columns:
+        iv = df['implied_volatility'].to_numpy(dtype=float, na_value=np.nan)
+        # IV zero ou negativa não é utilizável: como IV ausente, o contrato não
+        # recebe choque de modelo e mantém o gamma informado pela API
+        iv = np.where(iv > 0, iv, np.nan)
+    else:
+        iv = np.full(len(df), np.nan)
+
+    chain = {
+        'spot': float(spot),
+        'strike': strike,
+        'strikes': strikes,
+        'group_starts': group_starts,
+        'strike_index': np.searchsorted(strikes, strike),
+        'is_call': (df['type'] == 'call').to_numpy(),
+        'sign': np.where(df['type'] == 'call', 1.0, -1.0),
+        'open_interest': df['open_interest'].to_numpy(dtype=float),
+        'gamma': df['gamma'].to_numpy(dtype=float),
+        'iv': iv,
+        'days': days,
+    }
+    with np.errstate(invalid='ignore'):
+        chain['model_gamma'] = bs_gamma(
+            chain['spot'], strike, iv, np.maximum(days, MIN_DAYS) / 365
+        )
+    return chain
+
+
+def _shock_arrays(chain, shocks):
+    """
+    Converte a lista de choques em vetores (um valor por cenário) e na matriz de OI.
+    """
+    n = len(shocks)
+    iv_points = np.array([float(s.get('iv_points', 0.0)) for s in shocks])
+    days = np.array([float(s.get('days', 0.0)) for s in shocks])
+    spot_pct = np.array([float(s.get('spot_pct', 0.0)) for s in shocks])
+
+    strikes = chain['strikes']
+    oi_factors = np.ones((n, len(strikes)))
+    for i, shock in enumerate(shocks):
+        for strike, factor in (shock.get('oi_scale') or {}).items():
+            index = np.searchsorted(strikes, float(strike))
+            if index < len(strikes) and strikes[index] == float(strike):
+                oi_factors[i, index] = float(factor)
+            else:
+                print(f"Aviso: strike {strike} do cenário '{shock.get('name', i)}' não existe na cadeia.")
+
+    return iv_points, days, spot_pct, oi_factors
+
+
+def _evaluate_chunk(chain, iv_points, days, spot_pct, oi_factors):
+    """
+    Calcula o GEX por strike (calls e puts) para um bloco de cenários.
+
+    Returns:
+        tuple: (GEX de calls por strike, GEX de puts por strike), ambos cenários × strikes
+    """
+    spot = chain['spot'] * (1 + spot_pct[:, None] / 100)
+    sigma = np.maximum(chain['iv'][None, :] + iv_points[:, None] / 100, MIN_IV)
+    remaining = chain['days'][None, :] - days[:, None]
+    years = np.maximum(remaining, MIN_DAYS) / 365
+
+    # Variação do gamma do modelo aplicada sobre o gamma informado pela API;
+    # contratos sem IV utilizável (NaN) ficam com variação zero
+    with np.errstate(invalid='ignore', divide='ignore'):
+        change = bs_gamma(spot, chain['strike'][None, :], sigma, years) - chain['model_gamma'][None, :]
+    gamma = np.maximum(chain['gamma'][None, :] + np.nan_to_num(change), 0.0)
+
+    # Contratos que vencem durante o choque deixam de contribuir. Os que já vinham
+    # vencidos na cadeia (ou sem vencimento conhecido) mantêm o gamma, como no
+    # processamento diário
+    expires = (chain['days'] >= 0)[None, :] & (remaining < 0)
+    gamma[expires] = 0.0
+
+    open_interest = chain['open_interest'][None, :] * oi_factors[:, chain['strike_index']]
+    gex = open_interest * gamma * 100 * chain['sign'][None, :]
+
+    calls = np.where(chain['is_call'][None, :], gex, 0.0)
+    puts = gex - calls
+    starts = chain['group_starts']
+    return np.add.reduceat(calls, starts, axis=1), np.add.reduceat(puts, starts, axis=1)
+
+
+def _levels_from_strikes(strikes, call_gex, put_gex, has_calls, has_puts, spot):
+    """
+    Extrai os níveis chave de cada cenário (mesmas regras de `identify_key_levels`).
+    """
+    total_by_strike = call_gex + put_gex
+    total_gex = total_by_strike.sum(axis=1)
+
+    call_index = np.argmax(np.where(has_calls, call_gex, -np.inf), axis=1)
+    put_index = np.argmax(np.where(has_puts, np.abs(put_gex), -np.inf), axis=1)
+
+    # Gamma Flip: primeira troca de sinal entre strikes vizinhos
+    current, following = total_by_strike[:, :-1], total_by_strike[:, 1:]
+    to_negative = (current > 0) & (following < 0)
+    to_positive = (current < 0) & (following > 0)
+    crossing = to_negative | to_positive
+    first = np.argmax(crossing, axis=1)
+    found = crossing.any(axis=1)
+
+    rows = np.arange(len(total_gex))
+    levels = []
+    for i in rows:
+        gamma_flip = None
+        if found[i]:
+            j = first[i]
+            gamma_flip = float(strikes[j] if to_negative[i, j] else strikes[j + 1])
+        levels.append({
+            'call_wall': {
+                'strike': float(strikes[call_index[i]]) if has_calls.any() else None,
+                'gex': float(call_gex[i, call_index[i]]) if has_calls.any() else None
+            },
+            'put_wall': {
+                'strike': float(strikes[put_index[i]]) if has_puts.any() else None,
+                'gex': float(put_gex[i, put_index[i]]) if has_puts.any() else None
+            },
+            'gamma_flip': gamma_flip,
+            'total_gex': float(total_gex[i]),
+            'spot': float(spot[i]),
+            'market_regime': 'Positive Gamma' if total_gex[i] > 0 else 'Negative Gamma'
+        })
+    return levels
+
+
+def run_scenarios(chain, shocks, chunk_size=CHUNK_SIZE, workers=None):
+    """
+    Avalia todos os cenários em lote e retorna os níveis chave de cada um.
+
+    Os cenários são divididos em blocos avaliados em paralelo por threads (as
+    operações do NumPy liberam o GIL), limitando a memória a blocos × contratos.
+
+    Args:
+        chain (dict): Cadeia preparada por `prepare_chain`
+        shocks (list): Lista de choques (ver docstring do módulo)
+        chunk_size (int): Cenários por bloco
+        workers (int): Número de threads (padrão: número de CPUs)
+
+    Returns:
+        list: Para cada choque, um dicionário com 'scenario', 'shock' e 'key_levels'
+    """
+    if chain is None or not shocks:
+        return []
+
+    iv_points, days, spot_pct, oi_factors = _shock_arrays(chain, shocks)
+
+    bounds = [(start, min(start + chunk_size, len(shocks))) for start in range(0, len(shocks), chunk_size)]
+
+    def evaluate(bound):
+        a, b = bound
+        return _evaluate_chunk(chain, iv_points[a:b], days[a:b], spot_pct[a:b], oi_factors[a:b])
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(bounds) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(evaluate, bounds))
+    else:
+        results = [evaluate(bound) for bound in bounds]
+
+    call_gex = np.vstack([calls for calls, _ in results])
+    put_gex = np.vstack([puts for _, puts in results])
+
+    strike_count = len(chain['strikes'])
+    has_calls = np.bincount(chain['strike_index'][chain['is_call']], minlength=strike_count) > 0
+    has_puts = np.bincount(chain['strike_index'][~chain['is_call']], minlength=strike_count) > 0
+
+    spot = chain['spot'] * (1 + spot_pct / 100)
+    levels = _levels_from_strikes(chain['strikes'], call_gex, put_gex, has_calls, has_puts, spot)
+
+    return [
+        {'scenario': shock.get('name', f"Cenário {i + 1}"), 'shock': shock, 'key_levels': level}
+        for i, (shock, level) in enumerate(zip(shocks, levels))
+    ]
+
+
+def print_scenarios(results):
+    """
+    Imprime a tabela de níveis por cenário.
+    """
+    def price(value):
+        return f"${value:.2f}" if value is not None else "N/A"
+
+    print(f"{'Cenário':<28}{'Call Wall':>11}{'Put Wall':>11}{'Gamma Flip':>12}{'Total GEX':>16}  Regime")
+    for result in results:
+        levels = result['key_levels']
+        print(f"{result['scenario']:<28}{price(levels['call_wall']['strike']):>11}"
+              f"{price(levels['put_wall']['strike']):>11}{price(levels['gamma_flip']):>12}"
+              f"{levels['total_gex']:>16,.0f}  {levels['market_regime']}")
+
+
+def save_scenarios(results, symbol):
+    """
+    Salva os resultados dos cenários em arquivo JSON.
+
+    Args:
+        results (list): Resultados de `run_scenarios`
+        symbol (str): Símbolo do ativo
+
+    Returns:
+        bool: True se bem-sucedido
+    """
+    os.makedirs(SCENARIOS_DIR, exist_ok=True)
+
+    today = datetime.now().strftime('%Y-%m-%d')
+    filename = SCENARIOS_DIR / f"{today}_{symbol}.json"
+
+    output = {
+        'date': today,
+        'symbol': symbol,
+        'timestamp': datetime.now().isoformat(),
+        'scenarios': results
+    }
+
+    try:
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(output, f, indent=2, ensure_ascii=False)
+        print(f"\nCenários salvos em: {filename}")
+        return True
+    except Exception as e:
+        print(f"Erro ao salvar cenários: {e}")
+        return False
+
+
+def main():
+    """
+    Função principal do script.
+    """
+    import process_data
+    import validate_data
+
+    symbol = os.getenv('TARGET_SYMBOL', 'QQQ')
+
+    print(f"=== Motor de Cenários GEX ===")
+    print(f"Símbolo: {symbol}")
+    print(f"Data/Hora: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print()
+
+    shocks = DEFAULT_SHOCKS
+    if len(sys.argv) > 1:
+        try:
+            with open(sys.argv[1], 'r', encoding='utf-8') as f:
+                shocks = json.load(f)
+        except Exception as e:
+            print(f"Erro ao carregar choques: {e}")
+            sys.exit(1)
+
+    raw_data = process_data.load_latest_raw_data(symbol)
+    df = process_data.parse_options_data(raw_data) if raw_data else None
+    if df is None:
+        print("\n✗ Falha ao carregar dados de opções.")
+        sys.exit(1)
+
+    df, _, _ = validate_data.validate_options_data(df)
+    spot = process_data.estimate_spot(df)
+    chain = prepare_chain(df, spot)
+    if chain is None:
+        print("\n✗ Não foi possível estimar o spot ou não há contratos válidos.")
+        sys.exit(1)
+
+    print(f"Spot estimado: ${spot:.2f}")
+    print(f"Avaliando {len(shocks)} cenário(s) sobre {len(chain['strike'])} contratos...\n")
+    results = run_scenarios(chain, shocks)
+    print_scenarios(results)
+
+    if save_scenarios(results, symbol):
+        print("\n✓ Cenários calculados com sucesso!")
+        sys.exit(0)
+    else:
+        print("\n✗ Falha ao salvar cenários.")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
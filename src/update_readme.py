@@ -1,5 +1,7 @@
 """
 Script para atualizar o README.md com os resultados da análise diária.
+Com TARGET_SYMBOLS (lista separada por vírgulas) também gera o DASHBOARD.md
+com todos os símbolos acompanhados.
 """
 
 import os
@@ -8,6 +10,8 @@ import json
 from datetime import datetime
 from pathlib import Path
 
+import report_renderer
+
 def load_latest_processed_data(symbol):
     """
     Carrega o arquivo de dados processados mais recente.
@@ -52,121 +56,27 @@ def generate_readme_content(data):
     Returns:
         str: Conteúdo do README em Markdown
     """
-    if not data:
-        return None
-    
-    symbol = data['symbol']
-    date = data['date']
-    levels = data['key_levels']
-    
-    # Determinar viés de mercado
-    regime = levels['market_regime']
-    regime_emoji = "🟢" if regime == "Positive Gamma" else "🔴"
-    
-    # Interpretação do regime
-    if regime == "Positive Gamma":
-        interpretation = """
-**Interpretação**: O mercado está em regime de **Gamma Positivo**. Neste cenário, os market makers 
-tendem a negociar **contra a tendência** (compram em quedas, vendem em altas) para se proteger. 
-Isso **suprime a volatilidade** e cria um efeito de "imã" nos preços, mantendo o mercado em um range.
+    return report_renderer.render_readme(data)
 
-**Estratégia Sugerida**: Buscar operações de reversão nos níveis de Call Wall (resistência) e Put Wall (suporte).
-"""
-    else:
-        interpretation = """
-**Interpretação**: O mercado está em regime de **Gamma Negativo**. Neste cenário, os market makers 
-tendem a negociar **a favor da tendência** (compram em altas, vendem em quedas) para se proteger. 
-Isso **amplifica a volatilidade** e acelera os movimentos, podendo levar a "gamma squeezes".
-
-**Estratégia Sugerida**: Operar a favor do rompimento. Se o preço romper o Gamma Flip, espera-se movimento acelerado.
-"""
+def generate_dashboard_content(datasets):
+    """
+    Gera o conteúdo do DASHBOARD.md com todos os símbolos.
     
-    content = f"""# Análise de Exposição Gamma (GEX) - {symbol}
-
-## 📊 Última Atualização: {date}
-
----
-
-## 🎯 Níveis Chave Identificados
-
-| Nível | Valor | Descrição |
-|-------|-------|-----------|
-| **Call Wall** 📈 | ${levels['call_wall']['strike']:.2f} | Resistência forte - Maior concentração de Gamma de CALLs |
-| **Put Wall** 📉 | ${levels['put_wall']['strike']:.2f} | Suporte forte - Maior concentração de Gamma de PUTs |
-| **Gamma Flip** ⚡ | ${levels['gamma_flip']:.2f} | Ponto de mudança de regime de volatilidade |
-
----
-
-## {regime_emoji} Regime de Mercado
-
-**Status Atual**: {regime}
-
-**Total GEX**: {levels['total_gex']:,.0f}
-
-{interpretation}
-
----
-
-## 📈 Visualização da Exposição Gamma
-
-![GEX Chart](charts/latest_{symbol}_gex.png)
-
-*Gráfico atualizado automaticamente. Barras verdes representam CALLs (GEX positivo), barras vermelhas representam PUTs (GEX negativo).*
-
----
-
-## 📖 Como Usar Esta Análise
-
-### Antes da Abertura do Mercado (9:30 AM ET)
-
-1. **Verifique o Regime de Mercado** (Gamma Positivo ou Negativo)
-2. **Identifique os Níveis Chave** (Call Wall, Put Wall, Gamma Flip)
-3. **Observe o Preço Pré-Mercado** em relação aos níveis
-
-### Durante os Primeiros 90 Minutos
-
-#### Se o mercado está em **Gamma Positivo**:
-- Espere reversões nos níveis de Call Wall e Put Wall
-- O preço tende a ser "puxado" de volta para dentro do range
-- Volatilidade suprimida
-
-#### Se o mercado está em **Gamma Negativo**:
-- Espere movimentos direcionais acelerados
-- Rompimentos tendem a continuar
-- Volatilidade amplificada
-
----
-
-## 🔧 Sobre Este Sistema
-
-Este sistema automatizado coleta dados de opções diariamente e calcula a exposição Gamma (GEX) 
-dos market makers para identificar zonas de alta probabilidade de suporte, resistência e mudança 
-de regime de volatilidade.
-
-**Fonte de Dados**: Alpha Vantage API  
-**Atualização**: Diária, via GitHub Actions  
-**Cálculo**: GEX = Open Interest × Gamma × 100 × ±1
-
----
-
-## ⚠️ Disclaimer
-
-Esta análise é apenas para fins educacionais e informativos. Não constitui aconselhamento financeiro. 
-Sempre faça sua própria pesquisa e consulte um profissional qualificado antes de tomar decisões de investimento.
-
----
-
-*Última atualização automática: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} UTC*
-"""
+    Args:
+        datasets (list): Dados processados de cada símbolo
     
-    return content
+    Returns:
+        str: Conteúdo do dashboard em Markdown
+    """
+    return report_renderer.render_dashboard(datasets)
 
-def update_readme(content):
+def update_readme(content, filename='README.md'):
     """
-    Atualiza o arquivo README.md com o novo conteúdo.
+    Atualiza o arquivo com o novo conteúdo, apenas se houver mudança.
     
     Args:
         content (str): Novo conteúdo do README
+        filename (str): Arquivo de saída
     
     Returns:
         bool: True se bem-sucedido, False caso contrário
@@ -176,37 +86,48 @@ def update_readme(content):
         return False
     
     try:
-        with open('README.md', 'w', encoding='utf-8') as f:
-            f.write(content)
-        
-        print("README.md atualizado com sucesso!")
+        if report_renderer.write_if_changed(filename, content):
+            print(f"{filename} atualizado com sucesso!")
+        else:
+            print(f"{filename} já está atualizado; nenhuma alteração gravada.")
         return True
     except Exception as e:
-        print(f"Erro ao atualizar README: {e}")
+        print(f"Erro ao atualizar {filename}: {e}")
         return False
 
+def get_symbols():
+    """
+    Retorna os símbolos acompanhados (TARGET_SYMBOLS ou TARGET_SYMBOL).
+    O primeiro símbolo é o usado no README.md.
+    """
+    symbols = os.getenv('TARGET_SYMBOLS', '')
+    symbols = [s.strip() for s in symbols.split(',') if s.strip()]
+    return symbols or [os.getenv('TARGET_SYMBOL', 'QQQ')]
+
 def main():
     """
     Função principal do script.
     """
-    symbol = os.getenv('TARGET_SYMBOL', 'QQQ')
+    symbols = get_symbols()
     
     print(f"=== Atualizador de README ===")
-    print(f"Símbolo: {symbol}")
+    print(f"Símbolo(s): {', '.join(symbols)}")
     print(f"Data/Hora: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print()
     
     # Carregar dados processados
-    data = load_latest_processed_data(symbol)
+    datasets = [load_latest_processed_data(symbol) for symbol in symbols]
+    data = datasets[0]
     if not data:
         print("\n✗ Falha ao carregar dados processados.")
         sys.exit(1)
     
-    # Gerar conteúdo do README
-    content = generate_readme_content(data)
+    # Gerar e atualizar README
+    success = update_readme(generate_readme_content(data))
     
-    # Atualizar README
-    success = update_readme(content)
+    # Dashboard apenas quando há mais de um símbolo
+    if success and len(symbols) > 1:
+        success = update_readme(generate_dashboard_content(datasets), 'DASHBOARD.md')
     
     if success:
         print("\n✓ README atualizado com sucesso!")
@@ -0,0 +1,187 @@
+"""
+Validação vetorizada dos dados de opções antes do cálculo de GEX.
+
+Todas as regras são máscaras booleanas sobre colunas inteiras (sem loops por linha):
+checagens de faixa e campos obrigatórios e, entre as linhas aprovadas, deduplicação
+por contrato mantendo a cotação válida mais recente. Linhas reprovadas vão para um arquivo de quarentena e o
+relatório (contadores por regra e score de qualidade) é salvo junto aos dados processados.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+QUARANTINE_DIR = Path('data/quarantine')
+
+VALID_TYPES = ('call', 'put')
+
+# Faixas plausíveis (gamma por ação; IV em fração, 10 = 1000%)
+GAMMA_MAX = 2.0
+IV_MAX = 10.0
+
+
+def deduplicate_contracts(df):
+    """
+    Marca contratos repetidos, mantendo a linha mais recente de cada contractID.
+
+    A mais recente é a de maior 'date'; em caso de empate, a última do payload.
+
+    Args:
+        df (pd.DataFrame): DataFrame com dados de opções
+
+    Returns:
+        np.ndarray: Máscara booleana com True nas linhas duplicadas descartadas
+    """
+    if 'contractID' not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+
+    contract_codes, _ = pd.factorize(df['contractID'])
+    order = None
+
+    if 'date' in df.columns and len(df):
+        dates = df['date'].to_numpy()
+        # Payload diário normal tem uma única data: não há o que ordenar
+        if (dates != dates[0]).any():
+            # Códigos ordenados das datas (YYYY-MM-DD ordena como texto)
+            date_codes, _ = pd.factorize(dates, sort=True)
+            order = np.argsort(date_codes, kind='stable')
+            contract_codes = contract_codes[order]
+
+    # Após a ordenação por data, a última ocorrência de cada contrato é a mais recente
+    duplicated = pd.Series(contract_codes).duplicated(keep='last').to_numpy()
+    # Contratos sem ID (código -1) não são deduplicados
+    duplicated &= contract_codes != -1
+
+    if order is not None:
+        restored = np.empty_like(duplicated)
+        restored[order] = duplicated
+        duplicated = restored
+    return duplicated
+
+
+def build_rule_masks(df):
+    """
+    Avalia as regras de validação como máscaras sobre as colunas.
+
+    Args:
+        df (pd.DataFrame): DataFrame com colunas numéricas já convertidas
+
+    Returns:
+        dict: Nome da regra -> máscara booleana (True = linha reprovada)
+    """
+    n = len(df)
+
+    def column(name):
+        if name in df.columns:
+            return df[name].to_numpy(dtype=float, na_value=np.nan)
+        return np.full(n, np.nan)
+
+    strike = column('strike')
+    open_interest = column('open_interest')
+    gamma = column('gamma')
+
+    if 'type' in df.columns:
+        invalid_type = ~df['type'].isin(VALID_TYPES).to_numpy()
+    else:
+        invalid_type = np.ones(n, dtype=bool)
+
+    # Comparações com NaN retornam False, então faixas e ausências são regras separadas
+    with np.errstate(invalid='ignore'):
+        masks = {
+            'invalid_type': invalid_type,
+            'invalid_strike': ~(strike > 0),
+            'missing_open_interest': np.isnan(open_interest),
+            'negative_open_interest': open_interest < 0,
+            'missing_gamma': np.isnan(gamma),
+            'gamma_out_of_range': (gamma < 0) | (gamma > GAMMA_MAX),
+        }
+
+        if 'volume' in df.columns:
+            masks['negative_volume'] = column('volume') < 0
+        if 'implied_volatility' in df.columns:
+            iv = column('implied_volatility')
+            masks['iv_out_of_range'] = (iv < 0) | (iv > IV_MAX)
+
+    return masks
+
+
+def validate_options_data(df):
+    """
+    Executa o portão de validação sobre o DataFrame de opções.
+
+    As regras de faixa e campos obrigatórios são avaliadas primeiro; a deduplicação
+    só considera as linhas que passaram nelas. Assim, se a cotação mais recente de
+    um contrato for inválida, a anterior (válida) é mantida em vez de o contrato
+    sumir do cálculo. Cada linha reprovada recebe como 'reason' a primeira regra
+    em que falhou (na ordem de `build_rule_masks`), ou 'duplicate_contract'.
+
+    Args:
+        df (pd.DataFrame): DataFrame retornado por `parse_options_data`
+
+    Returns:
+        tuple: (DataFrame válido, DataFrame em quarentena com coluna 'reason', relatório)
+    """
+    total = len(df)
+    masks = build_rule_masks(df)
+    rule_rejected = np.logical_or.reduce(list(masks.values()))
+
+    duplicated = np.zeros(total, dtype=bool)
+    duplicated[~rule_rejected] = deduplicate_contracts(df[~rule_rejected])
+
+    names = list(masks) + ['duplicate_contract']
+    conditions = list(masks.values()) + [duplicated]
+    rejected = rule_rejected | duplicated
+    reason = np.select([c[rejected] for c in conditions], names, default='')
+
+    rules = {name: int(mask.sum()) for name, mask in zip(names, conditions)}
+    valid_rows = total - int(rejected.sum())
+
+    report = {
+        'total_rows': total,
+        'valid_rows': valid_rows,
+        'quarantined_rows': total - valid_rows,
+        'rules': rules,
+        'score': round(100.0 * valid_rows / total, 2) if total else 0.0
+    }
+
+    clean = df[~rejected]
+    quarantine = df[rejected].assign(reason=reason)
+    return clean, quarantine, report
+
+
+def save_quarantine(quarantine, symbol, date):
+    """
+    Salva as linhas reprovadas em um arquivo CSV ao lado dos dados processados.
+
+    Sem linhas reprovadas, remove o arquivo do dia (se existir), para que um
+    reprocessamento não deixe uma quarentena antiga contradizendo o relatório.
+
+    Args:
+        quarantine (pd.DataFrame): Linhas em quarentena
+        symbol (str): Símbolo do ativo
+        date (str): Data no formato YYYY-MM-DD
+
+    Returns:
+        Path: Caminho do arquivo, ou None se não houver linhas reprovadas
+    """
+    filename = QUARANTINE_DIR / f"{date}_{symbol}.csv"
+
+    if quarantine is None or quarantine.empty:
+        filename.unlink(missing_ok=True)
+        return None
+
+    os.makedirs(QUARANTINE_DIR, exist_ok=True)
+    quarantine.to_csv(filename, index=False)
+    return filename
+
+
+def print_report(report):
+    """
+    Imprime o resumo da validação.
+    """
+    print(f"Qualidade dos dados: {report['score']:.2f}% "
+          f"({report['valid_rows']}/{report['total_rows']} linhas válidas)")
+    for rule, count in report['rules'].items():
+        if count:
+            print(f"  - {rule}: {count}")
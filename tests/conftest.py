@@ -0,0 +1,9 @@
+"""
+Configuração do pytest: os scripts de src/ são importados como módulos soltos,
+do mesmo jeito que quando executados com `python src/<script>.py`.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
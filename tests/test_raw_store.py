@@ -0,0 +1,138 @@
+"""
+Testes de ida e volta do armazenamento compacto dos dados brutos.
+"""
+
+import json
+
+import pytest
+
+import raw_store
+
+
+def record(contract, strike, option_type, **daily):
+    base = {
+        'contractID': contract,
+        'symbol': 'QQQ',
+        'expiration': '2026-10-23',
+        'strike': strike,
+        'type': option_type,
+    }
+    base.update(daily)
+    return base
+
+
+def exact_bytes(data):
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+def roundtrip(data, contracts=None):
+    contracts = [] if contracts is None else contracts
+    document = raw_store.encode_payload(data, contracts)
+    # O documento passa por JSON como no disco
+    document = json.loads(json.dumps(document))
+    return raw_store.decode_payload(document, contracts)
+
+
+PAYLOADS = {
+    'registro_sem_campo': {
+        'endpoint': 'Historical Options',
+        'message': 'success',
+        'data': [
+            record('A', '500.00', 'call', bid='1.00', ask='1.10', gamma='0.01'),
+            record('B', '500.00', 'put', bid='2.00', gamma='0.02'),
+            {'contractID': 'C', 'symbol': 'QQQ', 'type': 'put', 'bid': '3.00'},
+        ],
+    },
+    'coluna_no_meio_do_dia': {
+        'message': 'success',
+        'data': [
+            record('A', '500.00', 'call', bid='1.00'),
+            record('B', '505.00', 'call', bid='1.50'),
+            record('C', '510.00', 'call', bid='2.00', rho='0.05'),
+            record('D', '515.00', 'call', rho='0.06', bid='2.50'),
+        ],
+    },
+    'valores_aninhados': {
+        'meta': {'source': 'api', 'tags': ['a', 'b'], 'limits': {'calls': 25}},
+        'data': [
+            record('A', '500.00', 'call', greeks={'delta': '0.5', 'gamma': '0.01'}, quotes=[1, 2.5, None]),
+            record('B', '500.00', 'put', greeks={'delta': '-0.5'}, quotes=[], flag=True),
+        ],
+    },
+    'lista_data_vazia': {'endpoint': 'Historical Options', 'message': 'success', 'data': []},
+    'sem_chave_data': {'Information': 'Limite de requisições atingido', 'code': 429},
+    'data_nulo': {'message': 'success', 'data': None},
+    'data_dicionario': {'data': {}, 'message': 'success'},
+}
+
+
+@pytest.mark.parametrize('name', sorted(PAYLOADS))
+def test_roundtrip_is_byte_identical(name):
+    data = PAYLOADS[name]
+    assert exact_bytes(roundtrip(data)) == exact_bytes(data)
+
+
+def test_roundtrip_reuses_existing_contracts():
+    contracts = []
+    first = PAYLOADS['coluna_no_meio_do_dia']
+    roundtrip(first, contracts)
+    known = len(contracts)
+
+    second = {'data': [dict(r, date='2026-10-20') for r in first['data']]}
+    assert exact_bytes(roundtrip(second, contracts)) == exact_bytes(second)
+    assert len(contracts) == known
+
+
+def test_contract_table_is_append_only(tmp_path, monkeypatch):
+    monkeypatch.setattr(raw_store, 'RAW_DIR', tmp_path)
+    monkeypatch.setattr(raw_store, 'CONTRACTS_DIR', tmp_path / 'contracts')
+
+    day1 = PAYLOADS['registro_sem_campo']
+    path1 = raw_store.write_day(day1, 'QQQ', '2026-10-19')
+    deltas = raw_store.contract_delta_files('QQQ')
+    before = {p.name: p.read_bytes() for p in deltas}
+
+    day2 = {'data': day1['data'] + [record('Z', '520.00', 'call', bid='0.10')]}
+    path2 = raw_store.write_day(day2, 'QQQ', '2026-10-20')
+
+    after = raw_store.contract_delta_files('QQQ')
+    assert len(after) == len(deltas) + 1
+    # Arquivos já gravados não mudam; o novo só tem o contrato novo
+    assert all(before[p.name] == p.read_bytes() for p in deltas)
+    assert raw_store._read_json(after[-1])['contracts'] == [
+        {'contractID': 'Z', 'symbol': 'QQQ', 'expiration': '2026-10-23', 'strike': '520.00', 'type': 'call'}
+    ]
+
+    assert raw_store.verify_roundtrip(day1, path1, 'QQQ')
+    assert raw_store.verify_roundtrip(day2, path2, 'QQQ')
+
+    # Dia sem contratos novos não grava arquivo de contratos
+    raw_store.write_day(day2, 'QQQ', '2026-10-21')
+    assert len(raw_store.contract_delta_files('QQQ')) == len(after)
+
+    report = {row['date']: row for row in raw_store.storage_report('QQQ')}
+    assert report['2026-10-20']['after_bytes'] == path2.stat().st_size + after[-1].stat().st_size
+    assert report['2026-10-21']['after_bytes'] == raw_store.day_path('2026-10-21', 'QQQ').stat().st_size
+
+
+def test_unfaithful_document_writes_nothing(tmp_path, monkeypatch):
+    monkeypatch.setattr(raw_store, 'RAW_DIR', tmp_path)
+    monkeypatch.setattr(raw_store, 'CONTRACTS_DIR', tmp_path / 'contracts')
+    monkeypatch.setattr(raw_store, 'decode_payload', lambda document, contracts: {})
+
+    with pytest.raises(RuntimeError):
+        raw_store.write_day(PAYLOADS['registro_sem_campo'], 'QQQ', '2026-10-19')
+
+    assert raw_store.list_day_files('QQQ') == []
+    assert raw_store.contract_delta_files('QQQ') == []
+
+
+def test_failed_verification_removes_day_file(tmp_path, monkeypatch):
+    import collect_data
+
+    monkeypatch.setattr(raw_store, 'RAW_DIR', tmp_path)
+    monkeypatch.setattr(raw_store, 'CONTRACTS_DIR', tmp_path / 'contracts')
+    monkeypatch.setattr(raw_store, 'verify_roundtrip', lambda data, path, symbol: False)
+
+    assert not collect_data.save_raw_data(PAYLOADS['registro_sem_campo'], 'QQQ')
+    assert raw_store.latest_day_file('QQQ') is None
@@ -0,0 +1,130 @@
+"""
+Testes do estado incremental das métricas de regime.
+"""
+
+import json
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+import regime_state
+
+
+def levels(total_gex, spot=500.0):
+    return {
+        'call_wall': {'strike': 510.0},
+        'put_wall': {'strike': 490.0},
+        'gamma_flip': 498.0,
+        'spot': spot,
+        'total_gex': total_gex,
+    }
+
+
+def days(n, start=date(2025, 1, 1)):
+    return [(start + timedelta(days=i)).isoformat() for i in range(n)]
+
+
+def assert_window_matches(window, expected):
+    assert list(window['values']) == expected
+    assert window['sorted'] == sorted(expected)
+    assert window['count'] == len(expected)
+    if expected:
+        assert window['mean'] == pytest.approx(np.mean(expected))
+    if len(expected) > 1:
+        assert window['m2'] / (len(expected) - 1) == pytest.approx(np.var(expected, ddof=1), rel=1e-9)
+
+
+def test_windows_match_numpy_with_reprocessed_days():
+    rng = np.random.default_rng(7)
+    state = regime_state.new_state('QQQ')
+    history = []
+
+    for day in days(300):
+        # Cada dia é reprocessado algumas vezes com valores diferentes
+        for _ in range(rng.integers(1, 4)):
+            value = float(rng.normal(1e9, 3e8))
+            analytics = regime_state.update_state(state, day, levels(value))
+        history.append(value)
+
+        for key, window in state['windows'].items():
+            assert_window_matches(window, history[-int(key):])
+
+        # Estatísticas calculadas contra os dias anteriores, sem o próprio dia
+        trailing = history[:-1][-20:]
+        stats = analytics['windows']['20']
+        assert stats['days'] == len(trailing)
+        if len(trailing) > 1:
+            expected = (value - np.mean(trailing)) / np.std(trailing, ddof=1)
+            assert stats['zscore'] == pytest.approx(expected, rel=1e-6)
+
+
+def test_reprocessing_restores_evicted_value():
+    window = regime_state.new_window(3)
+    for x in (1.0, 2.0, 3.0):
+        regime_state.window_push(window, x)
+
+    regime_state.window_push(window, 10.0)
+    assert list(window['values']) == [2.0, 3.0, 10.0]
+
+    regime_state.window_pop_last(window)
+    assert_window_matches(window, [1.0, 2.0, 3.0])
+
+    regime_state.window_push(window, 4.0)
+    assert_window_matches(window, [2.0, 3.0, 4.0])
+
+
+def test_welford_remove_down_to_empty():
+    window = regime_state.new_window(5)
+    for x in (4.0, 8.0, 15.0):
+        regime_state._welford_add(window, x)
+
+    regime_state._welford_remove(window, 15.0)
+    assert window['mean'] == pytest.approx(6.0)
+    assert window['m2'] == pytest.approx(8.0)
+
+    regime_state._welford_remove(window, 8.0)
+    regime_state._welford_remove(window, 4.0)
+    assert (window['count'], window['mean'], window['m2']) == (0, 0.0, 0.0)
+
+
+def test_second_day_zscore_uses_only_previous_day():
+    state = regime_state.new_state('QQQ')
+    regime_state.update_state(state, '2025-01-01', levels(100.0))
+    analytics = regime_state.update_state(state, '2025-01-02', levels(300.0))
+
+    stats = analytics['windows']['20']
+    assert stats['days'] == 1
+    assert stats['zscore'] is None
+    assert stats['percentile'] == 100.0
+
+
+def test_out_of_order_date_is_rejected():
+    state = regime_state.new_state('QQQ')
+    regime_state.update_state(state, '2025-01-02', levels(100.0))
+
+    assert regime_state.update_state(state, '2025-01-01', levels(200.0)) is None
+    assert state['last_date'] == '2025-01-02'
+    assert list(state['windows']['20']['values']) == [100.0]
+
+
+def test_rebuild_matches_incremental_state(tmp_path, monkeypatch):
+    monkeypatch.setattr(regime_state, 'PROCESSED_DIR', tmp_path / 'processed')
+    monkeypatch.setattr(regime_state, 'STATE_DIR', tmp_path / 'state')
+    regime_state.PROCESSED_DIR.mkdir()
+
+    rng = np.random.default_rng(3)
+    incremental = regime_state.new_state('QQQ')
+    for day in days(260):
+        day_levels = levels(float(rng.normal(1e9, 3e8)))
+        regime_state.update_state(incremental, day, day_levels)
+        path = regime_state.PROCESSED_DIR / f"{day}_QQQ.json"
+        path.write_text(json.dumps({'date': day, 'key_levels': day_levels}))
+
+    # Sem arquivo de estado, o carregamento reconstrói a partir do histórico
+    rebuilt = regime_state.load_state('QQQ')
+
+    assert rebuilt['last'] == incremental['last']
+    assert rebuilt['previous'] == incremental['previous']
+    for key, window in incremental['windows'].items():
+        assert_window_matches(rebuilt['windows'][key], list(window['values']))
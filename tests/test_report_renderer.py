@@ -0,0 +1,40 @@
+"""
+Testes da renderização do README e do dashboard.
+"""
+
+import report_renderer
+
+
+def processed(symbol):
+    return {
+        'symbol': symbol,
+        'date': '2026-10-19',
+        'timestamp': '2026-10-19T13:00:00',
+        'key_levels': {
+            'call_wall': {'strike': 500.0, 'gex': 1e6},
+            'put_wall': {'strike': 480.0, 'gex': -1e6},
+            'gamma_flip': 490.0,
+            'total_gex': 12345.0,
+            'spot': 495.0,
+            'market_regime': 'Positive Gamma',
+        },
+    }
+
+
+def test_dashboard_links_only_existing_charts(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_renderer, 'CHARTS_DIR', tmp_path)
+    (tmp_path / 'latest_QQQ_gex.png').write_bytes(b'')
+
+    content = report_renderer.render_dashboard([processed('QQQ'), processed('SPY')])
+
+    assert 'charts/latest_QQQ_gex.png' in content
+    assert 'charts/latest_SPY_gex.png' not in content
+
+
+def test_write_if_changed(tmp_path):
+    path = tmp_path / 'README.md'
+    content = report_renderer.render_readme(processed('QQQ'))
+
+    assert report_renderer.write_if_changed(path, content)
+    assert not report_renderer.write_if_changed(path, content)
+    assert path.read_text(encoding='utf-8') == content
@@ -0,0 +1,100 @@
+"""
+Testes do motor de cenários.
+"""
+
+import numpy as np
+import pandas as pd
+
+import process_data
+import scenarios
+
+SPOT = 500.0
+
+
+def chain_frame(zero_iv_every=None):
+    """
+    Cadeia sintética com gamma da API igual ao de Black-Scholes. Opcionalmente,
+    um a cada `zero_iv_every` contratos tem IV = 0 e gamma = 0 (sem vol utilizável).
+    """
+    rng = np.random.default_rng(0)
+    strikes = np.arange(400.0, 601.0, 1.0)
+    rows = []
+    for expiration, days in (('2026-10-23', 4), ('2026-11-20', 32)):
+        for strike in strikes:
+            for option_type in ('call', 'put'):
+                iv = 0.2 + 0.1 * abs(strike - SPOT) / 100
+                gamma = scenarios.bs_gamma(SPOT, strike, iv, days / 365)
+                rows.append({
+                    'contractID': f"{expiration}{option_type}{strike}",
+                    'date': '2026-10-19',
+                    'expiration': expiration,
+                    'strike': strike,
+                    'type': option_type,
+                    'open_interest': float(rng.integers(100, 5000)),
+                    'volume': 0.0,
+                    'gamma': float(gamma),
+                    'implied_volatility': iv,
+                })
+
+    df = pd.DataFrame(rows)
+    if zero_iv_every:
+        dead = np.arange(len(df)) % zero_iv_every == 0
+        df.loc[dead, ['implied_volatility', 'gamma']] = 0.0
+        # OI alto no dinheiro: sem a correção, um choque de IV criaria uma wall aqui
+        df.loc[dead & (df['strike'] == SPOT), 'open_interest'] = 1e6
+    return df
+
+
+def walls(results):
+    return [(r['key_levels']['call_wall']['strike'], r['key_levels']['put_wall']['strike']) for r in results]
+
+
+def test_base_scenario_keeps_api_gamma():
+    df = chain_frame()
+    chain = scenarios.prepare_chain(df, SPOT)
+    result = scenarios.run_scenarios(chain, [{'name': 'Base'}])[0]['key_levels']
+
+    gex = df['open_interest'] * df['gamma'] * 100 * np.where(df['type'] == 'call', 1, -1)
+    assert np.isclose(result['total_gex'], gex.sum())
+
+
+def test_base_scenario_matches_daily_levels():
+    df = chain_frame()
+    # Contratos já vencidos na cadeia entram no processamento diário com o gamma da API
+    expired = df['strike'] % 10 == 0
+    df.loc[expired, 'expiration'] = '2026-10-16'
+    df.loc[expired & (df['strike'] == 480.0), 'open_interest'] = 1e6
+
+    expected = process_data.identify_key_levels(process_data.calculate_gex(df))
+    result = scenarios.run_scenarios(scenarios.prepare_chain(df, SPOT), [{}])[0]['key_levels']
+
+    assert result['call_wall']['strike'] == expected['call_wall']['strike']
+    assert result['put_wall']['strike'] == expected['put_wall']['strike']
+    assert result['gamma_flip'] == expected['gamma_flip']
+    assert np.isclose(result['total_gex'], expected['total_gex'])
+
+
+def test_contracts_expiring_during_shock_stop_contributing():
+    df = chain_frame()
+    shocks = [{'days': 5}]
+    expiring = df['expiration'] == '2026-10-23'
+
+    full = scenarios.run_scenarios(scenarios.prepare_chain(df, SPOT), shocks)
+    remaining = scenarios.run_scenarios(scenarios.prepare_chain(df[~expiring], SPOT), shocks)
+
+    assert walls(full) == walls(remaining)
+    assert np.isclose(full[0]['key_levels']['total_gex'], remaining[0]['key_levels']['total_gex'])
+
+
+def test_iv_shock_ignores_zero_iv_contracts():
+    df = chain_frame(zero_iv_every=7)
+    dead = df['implied_volatility'] <= 0
+    shocks = [{'name': 'Base'}, {'iv_points': 3.0}, {'iv_points': -3.0}, {'iv_points': 3.0, 'spot_pct': 1.0}]
+
+    with_dead = scenarios.run_scenarios(scenarios.prepare_chain(df, SPOT), shocks)
+    without_dead = scenarios.run_scenarios(scenarios.prepare_chain(df[~dead], SPOT), shocks)
+
+    # Contratos com IV zero têm gamma zero e devem continuar contribuindo zero
+    assert walls(with_dead) == walls(without_dead)
+    for a, b in zip(with_dead, without_dead):
+        assert np.isclose(a['key_levels']['total_gex'], b['key_levels']['total_gex'])
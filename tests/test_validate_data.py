@@ -0,0 +1,123 @@
+"""
+Testes do portão de validação dos dados de opções.
+"""
+
+import pandas as pd
+
+import validate_data
+
+
+def chain(open_interest):
+    return pd.DataFrame({
+        'contractID': ['A', 'B'],
+        'date': ['2026-10-19', '2026-10-19'],
+        'type': ['call', 'put'],
+        'strike': [500.0, 500.0],
+        'open_interest': open_interest,
+        'gamma': [0.01, 0.02],
+    })
+
+
+def test_reprocessing_clean_day_removes_old_quarantine(tmp_path, monkeypatch):
+    monkeypatch.setattr(validate_data, 'QUARANTINE_DIR', tmp_path)
+
+    _, quarantine, report = validate_data.validate_options_data(chain([100.0, -5.0]))
+    assert report['rules']['negative_open_interest'] == 1
+    path = validate_data.save_quarantine(quarantine, 'QQQ', '2026-10-19')
+    assert path.exists()
+
+    _, quarantine, report = validate_data.validate_options_data(chain([100.0, 5.0]))
+    assert report['quarantined_rows'] == 0
+    assert validate_data.save_quarantine(quarantine, 'QQQ', '2026-10-19') is None
+    assert not path.exists()
+
+
+def test_invalid_latest_quote_keeps_older_valid_row():
+    df = pd.DataFrame({
+        'contractID': ['A', 'A', 'B'],
+        'date': ['2026-10-19'] * 3,
+        'type': ['call', 'call', 'put'],
+        'strike': [500.0, 500.0, 495.0],
+        'open_interest': [100.0, -5.0, 50.0],
+        'gamma': [0.01, 0.01, 0.02],
+    })
+
+    clean, quarantine, report = validate_data.validate_options_data(df)
+
+    assert clean['open_interest'].tolist() == [100.0, 50.0]
+    assert quarantine['reason'].tolist() == ['negative_open_interest']
+    assert report['rules']['duplicate_contract'] == 0
+
+
+def test_keeps_latest_date_then_last_in_payload():
+    # A: a linha mais antiga vem depois no payload; B: empate de data
+    df = pd.DataFrame({
+        'contractID': ['A', 'B', 'A', 'B', 'A'],
+        'date': ['2026-10-19', '2026-10-19', '2026-10-18', '2026-10-19', '2026-10-17'],
+        'type': ['call', 'put', 'call', 'put', 'call'],
+        'strike': [500.0, 495.0, 500.0, 495.0, 500.0],
+        'open_interest': [1.0, 2.0, 3.0, 4.0, 5.0],
+        'gamma': [0.01] * 5,
+    })
+
+    clean, quarantine, report = validate_data.validate_options_data(df)
+
+    assert clean['open_interest'].tolist() == [1.0, 4.0]
+    assert quarantine['open_interest'].tolist() == [2.0, 3.0, 5.0]
+    assert set(quarantine['reason']) == {'duplicate_contract'}
+    assert report['rules']['duplicate_contract'] == 3
+
+
+def test_rows_without_contract_id_are_not_deduplicated():
+    df = pd.DataFrame({
+        'contractID': [None, None, 'A'],
+        'date': ['2026-10-19'] * 3,
+        'type': ['call', 'call', 'put'],
+        'strike': [500.0, 500.0, 495.0],
+        'open_interest': [1.0, 2.0, 3.0],
+        'gamma': [0.01] * 3,
+    })
+
+    clean, _, report = validate_data.validate_options_data(df)
+
+    assert len(clean) == 3
+    assert report['rules']['duplicate_contract'] == 0
+
+
+def test_missing_type_column_rejects_every_row():
+    df = chain([100.0, 5.0]).drop(columns='type')
+
+    clean, quarantine, report = validate_data.validate_options_data(df)
+
+    assert clean.empty
+    assert set(quarantine['reason']) == {'invalid_type'}
+    assert report['rules']['invalid_type'] == 2
+
+
+def test_reason_is_first_failed_rule_and_counters_count_every_rule():
+    df = pd.DataFrame({
+        'contractID': ['A', 'B', 'C', 'D'],
+        'date': ['2026-10-19'] * 4,
+        'type': ['call', 'call', 'put', 'put'],
+        'strike': [-1.0, 500.0, 500.0, 505.0],
+        'open_interest': [-5.0, float('nan'), 10.0, 10.0],
+        'gamma': [3.0, 0.01, float('nan'), 0.02],
+    })
+
+    clean, quarantine, report = validate_data.validate_options_data(df)
+
+    assert clean['contractID'].tolist() == ['D']
+    assert quarantine['reason'].tolist() == ['invalid_strike', 'missing_open_interest', 'missing_gamma']
+    assert report['rules'] == {
+        'invalid_type': 0,
+        'invalid_strike': 1,
+        'missing_open_interest': 1,
+        'negative_open_interest': 1,
+        'missing_gamma': 1,
+        'gamma_out_of_range': 1,
+        'duplicate_contract': 0,
+    }
+    assert report['total_rows'] == 4
+    assert report['valid_rows'] == 1
+    assert report['quarantined_rows'] == 3
+    assert report['score'] == 25.0